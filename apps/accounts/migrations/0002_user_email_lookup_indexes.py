@@ -0,0 +1,31 @@
+# Generated by Django 4.2.9 on 2026-10-15 09:30
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(
+                django.db.models.functions.text.Lower('email'),
+                name='user_email_lower_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=GinIndex(
+                OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'),
+                name='user_email_trgm_idx'
+            ),
+        ),
+    ]
@@ -7,7 +7,9 @@ Custom User model and Wallet Connection for Web3 authentication.
 import uuid
 import secrets
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Lower, Upper
 from django.utils import timezone
 
 
@@ -86,6 +88,15 @@ class User(AbstractUser):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
+        indexes = [
+            # Case-insensitive recipient lookup (filter on Lower('email'))
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+            # email__icontains search - Django compares UPPER(email)
+            GinIndex(
+                OpClass(Upper('email'), name='gin_trgm_ops'),
+                name='user_email_trgm_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.email
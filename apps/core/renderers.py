@@ -0,0 +1,30 @@
+"""
+Core Renderers
+==============
+orjson-backed drop-in for DRF's JSONRenderer.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Render JSON with orjson.
+
+    Types orjson does not handle natively (Decimal, lazy strings, ...) and
+    datetimes fall back to DRF's encoder, so the output matches JSONRenderer.
+    """
+
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        return orjson.dumps(
+            data,
+            default=self._encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        )
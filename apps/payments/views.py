@@ -210,6 +210,7 @@ class FiatWithdrawalCreateView(APIView):
         
         # Check balance
         from apps.wallets.models import Balance
+        from apps.wallets.services.balance_cache import invalidate_cached_balance
         balance = Balance.objects.filter(
             user=request.user,
             currency__symbol=source_currency
@@ -229,6 +230,7 @@ class FiatWithdrawalCreateView(APIView):
         balance.available -= source_amount
         balance.locked += source_amount
         balance.save()
+        invalidate_cached_balance(balance.user_id, balance.currency_id)
         
         # Create withdrawal
         withdrawal = FiatWithdrawal.objects.create(
@@ -461,6 +463,7 @@ class AdminProcessFiatWithdrawalView(APIView):
         
         from django.utils import timezone
         from apps.wallets.models import Balance, BalanceTransaction
+        from apps.wallets.services.balance_cache import invalidate_cached_balance
         
         if action == 'approve':
             withdrawal.status = 'completed'
@@ -478,6 +481,7 @@ class AdminProcessFiatWithdrawalView(APIView):
             if balance:
                 balance.locked -= withdrawal.source_amount
                 balance.save()
+                invalidate_cached_balance(balance.user_id, balance.currency_id)
                 
                 BalanceTransaction.objects.create(
                     balance=balance,
@@ -505,6 +509,7 @@ class AdminProcessFiatWithdrawalView(APIView):
                 balance.locked -= withdrawal.source_amount
                 balance.available += withdrawal.source_amount
                 balance.save()
+                invalidate_cached_balance(balance.user_id, balance.currency_id)
         
         return Response(FiatWithdrawalSerializer(withdrawal).data)
 
@@ -525,6 +530,7 @@ class AdminProcessCryptoWithdrawalView(APIView):
         
         from django.utils import timezone
         from apps.wallets.models import Balance, BalanceTransaction
+        from apps.wallets.services.balance_cache import invalidate_cached_balance
         
         if action == 'broadcast':
             try:
@@ -554,5 +560,6 @@ class AdminProcessCryptoWithdrawalView(APIView):
                 balance.locked -= withdrawal.amount
                 balance.available += withdrawal.amount
                 balance.save()
+                invalidate_cached_balance(balance.user_id, balance.currency_id)
             
             return Response(CryptoWithdrawalSerializer(withdrawal).data)
@@ -7,4 +7,6 @@ class WalletsConfig(AppConfig):
     verbose_name = 'Wallets & Balances'
 
     def ready(self):
-        pass
\ No newline at end of file
+        # Register cache invalidation signals
+        import apps.wallets.services.currency_cache  # noqa: F401
+        import apps.wallets.services.deposit_address  # noqa: F401
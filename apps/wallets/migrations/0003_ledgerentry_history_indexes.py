@@ -0,0 +1,25 @@
+# Generated by Django 4.2.9 on 2026-10-15 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallets', '0002_p2ptransfer'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['user', '-created_at'], name='wallets_led_user_id_e51c53_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['user', 'currency', '-created_at'], name='wallets_led_user_id_603967_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgerentry',
+            index=models.Index(fields=['user', 'entry_type', '-created_at'], name='wallets_led_user_id_a88bf4_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-15 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallets', '0003_ledgerentry_history_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='p2ptransfer',
+            index=models.Index(fields=['sender', '-created_at'], name='wallets_p2p_sender__26b9f9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='p2ptransfer',
+            index=models.Index(fields=['recipient', '-created_at'], name='wallets_p2p_recipie_c8dcad_idx'),
+        ),
+    ]
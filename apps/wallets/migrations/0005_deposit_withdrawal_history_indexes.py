@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-15 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallets', '0004_p2ptransfer_history_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deposit',
+            index=models.Index(fields=['user', '-created_at'], name='wallets_dep_user_id_ece5bb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='withdrawal',
+            index=models.Index(fields=['user', '-created_at'], name='wallets_wit_user_id_cda309_idx'),
+        ),
+    ]
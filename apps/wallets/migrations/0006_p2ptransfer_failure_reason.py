@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallets', '0005_deposit_withdrawal_history_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='p2ptransfer',
+            name='failure_reason',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
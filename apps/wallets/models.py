@@ -227,6 +227,9 @@ class LedgerEntry(models.Model):
         indexes = [
             models.Index(fields=['user', 'currency']),
             models.Index(fields=['reference_type', 'reference_id']),
+            models.Index(fields=['user', '-created_at']),
+            models.Index(fields=['user', 'currency', '-created_at']),
+            models.Index(fields=['user', 'entry_type', '-created_at']),
         ]
 
     def __str__(self):
@@ -285,6 +288,9 @@ class Deposit(models.Model):
         verbose_name_plural = 'Deposits'
         unique_together = ['tx_hash', 'chain_id']
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.amount} {self.currency.symbol} - {self.status}"
@@ -353,6 +359,9 @@ class Withdrawal(models.Model):
         verbose_name = 'Withdrawal'
         verbose_name_plural = 'Withdrawals'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.amount} {self.currency.symbol} to {self.to_address[:10]}... - {self.status}"
@@ -400,11 +409,16 @@ class P2PTransfer(models.Model):
     amount = models.DecimalField(max_digits=24, decimal_places=8)
     note = models.CharField(max_length=255, blank=True, default='')
     status = models.CharField(max_length=20, default='completed')
+    failure_reason = models.CharField(max_length=255, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['sender', '-created_at']),
+            models.Index(fields=['recipient', '-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.sender} -> {self.recipient}: {self.amount} {self.currency.symbol}"
\ No newline at end of file
@@ -1,2 +1,2 @@
 """Wallet services."""
-from .ledger import LedgerService
\ No newline at end of file
+from .ledger import LedgerService, LedgerMutation
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Balance Cache
+=============
+Read-through cache of (available, locked) per user and currency, used by
+balance read endpoints.
+
+PostgreSQL stays the source of truth: ledger writes never read from this
+cache, and every balance mutation drops the cached entry once its
+transaction commits.
+"""
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.wallets.models import Balance
+
+BALANCE_CACHE_TIMEOUT = 60  # seconds
+
+
+def _cache_key(user_id, currency_id) -> str:
+    return f'bal:{user_id}:{currency_id}'
+
+
+def get_cached_balance(user_id, currency_id) -> tuple[Decimal, Decimal]:
+    """
+    Get (available, locked) for a user and currency.
+
+    Missing balances read as zero and are not created.
+    """
+    key = _cache_key(user_id, currency_id)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    row = Balance.objects.filter(
+        user_id=user_id,
+        currency_id=currency_id
+    ).values_list('available', 'locked').first()
+
+    value = tuple(row) if row is not None else (Decimal('0'), Decimal('0'))
+    cache.set(key, value, BALANCE_CACHE_TIMEOUT)
+    return value
+
+
+def invalidate_cached_balance(user_id, currency_id):
+    """Drop the cached balance once the current transaction commits."""
+    key = _cache_key(user_id, currency_id)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,110 @@
+"""
+Currency Cache
+==============
+Two-level cache for Currency lookups.
+Currencies change rarely (admin operations) but are read on nearly every
+API call, so lookups by symbol are served from memory.
+
+1. Per-process lru_cache, expiring with a short TTL bucket
+2. Shared Django cache (Redis in production), so a process with a cold
+   memory cache still does not hit the database
+
+Both levels are cleared once a Currency save/delete commits. Other worker
+processes drop their memory copy once the TTL bucket rolls over.
+"""
+
+import time
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.wallets.models import Currency
+
+CURRENCY_CACHE_TTL = 60  # seconds
+SHARED_CURRENCY_CACHE_TIMEOUT = 300  # seconds
+
+ACTIVE_CURRENCIES_CACHE_KEY = 'cur:active:v1'
+
+
+def _currency_cache_key(symbol: str) -> str:
+    return f'cur:{symbol}'
+
+
+def _ttl_bucket() -> int:
+    """Current TTL bucket - part of every cache key so entries expire."""
+    return int(time.monotonic() // CURRENCY_CACHE_TTL)
+
+
+@lru_cache(maxsize=256)
+def _load_currency(symbol: str, bucket: int):
+    key = _currency_cache_key(symbol)
+    currency = cache.get(key)
+
+    if currency is None:
+        try:
+            currency = Currency.objects.get(symbol=symbol)
+        except Currency.DoesNotExist:
+            return None
+        cache.set(key, currency, SHARED_CURRENCY_CACHE_TIMEOUT)
+
+    return currency
+
+
+@lru_cache(maxsize=4)
+def _load_active_currencies(bucket: int) -> tuple:
+    currencies = cache.get(ACTIVE_CURRENCIES_CACHE_KEY)
+
+    if currencies is None:
+        currencies = tuple(Currency.objects.filter(is_active=True))
+        cache.set(ACTIVE_CURRENCIES_CACHE_KEY, currencies, SHARED_CURRENCY_CACHE_TIMEOUT)
+
+    return currencies
+
+
+def get_currency(symbol: str, active_only: bool = True) -> Currency:
+    """
+    Get a currency by symbol (case-insensitive).
+
+    Args:
+        symbol: Currency symbol, e.g. 'eth' or 'ETH'
+        active_only: Treat inactive currencies as missing
+
+    Returns:
+        Currency object
+
+    Raises:
+        Currency.DoesNotExist: If no (active) currency has this symbol
+    """
+    currency = _load_currency(symbol.upper(), _ttl_bucket())
+
+    if currency is None or (active_only and not currency.is_active):
+        raise Currency.DoesNotExist(f"Currency {symbol} not found")
+
+    return currency
+
+
+def get_active_currencies() -> tuple:
+    """Get all active currencies."""
+    return _load_active_currencies(_ttl_bucket())
+
+
+def clear_currency_cache():
+    """Drop all cached currency lookups for this process."""
+    _load_currency.cache_clear()
+    _load_active_currencies.cache_clear()
+
+
+@receiver(post_save, sender=Currency)
+@receiver(post_delete, sender=Currency)
+def _invalidate_currency_cache(sender, instance, **kwargs):
+    # After commit, so no reader can re-cache the row from before the change
+    keys = [_currency_cache_key(instance.symbol), ACTIVE_CURRENCIES_CACHE_KEY]
+
+    def invalidate():
+        cache.delete_many(keys)
+        clear_currency_cache()
+
+    transaction.on_commit(invalidate)
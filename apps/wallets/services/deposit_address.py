@@ -0,0 +1,91 @@
+"""
+Deposit Address Service
+=======================
+Builds the deposit address payload for a user and currency.
+Payloads are cached per (user, currency) and dropped whenever one of
+the user's wallet connections changes. The per-currency part of the
+payload is built once per process and currency.
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.accounts.models import WalletConnection
+from apps.wallets.models import Currency
+from apps.wallets.services.currency_cache import get_active_currencies
+
+DEPOSIT_ADDRESS_CACHE_TIMEOUT = 300  # seconds
+
+DEMO_DEPOSIT_ADDRESS = "0xDEMO_DEPOSIT_ADDRESS_GENERATE_UNIQUE_PER_USER"
+
+
+def _cache_key(user_id, currency_symbol: str) -> str:
+    return f'deposit-addr:{user_id}:{currency_symbol}'
+
+
+@lru_cache(maxsize=128)
+def _static_deposit_payload(symbol: str, chain_id: int, min_deposit: str) -> dict:
+    """
+    Fields of the payload that depend only on the currency.
+
+    Keyed on the currency values themselves, so an edited currency simply
+    gets a new entry in every process.
+    """
+    network_info = settings.BLOCKCHAIN_CONFIG['NETWORKS'].get(chain_id, {})
+
+    return {
+        'currency_symbol': symbol,
+        'address': DEMO_DEPOSIT_ADDRESS,
+        'chain_id': chain_id,
+        'network_name': network_info.get('name', 'Unknown Network'),
+        'min_deposit': min_deposit,
+        'confirmations_required': settings.BLOCKCHAIN_CONFIG['MIN_CONFIRMATIONS'],
+        'warning': 'DEMO MODE: This is a test address. Do not send real funds!'
+    }
+
+
+def _build_deposit_address(user, currency: Currency) -> dict:
+    wallet_address = WalletConnection.objects.filter(
+        user_id=user.id,
+        is_primary=True
+    ).values_list('wallet_address', flat=True).first()
+    if wallet_address:
+        note = "Your connected wallet: " + wallet_address
+    else:
+        note = "Connect a wallet to see your address"
+
+    static_payload = _static_deposit_payload(
+        currency.symbol, currency.chain_id, str(currency.min_deposit)
+    )
+    return {**static_payload, 'note': note}
+
+
+def get_deposit_address(user, currency: Currency) -> dict:
+    """
+    Get the deposit address payload for a user and currency.
+
+    Args:
+        user: User requesting the address
+        currency: Currency to deposit
+
+    Returns:
+        Dict ready to be returned by DepositAddressView
+    """
+    return cache.get_or_set(
+        _cache_key(user.id, currency.symbol),
+        lambda: _build_deposit_address(user, currency),
+        DEPOSIT_ADDRESS_CACHE_TIMEOUT
+    )
+
+
+@receiver(post_save, sender=WalletConnection)
+@receiver(post_delete, sender=WalletConnection)
+def _invalidate_deposit_addresses(sender, instance, **kwargs):
+    cache.delete_many([
+        _cache_key(instance.user_id, currency.symbol)
+        for currency in get_active_currencies()
+    ])
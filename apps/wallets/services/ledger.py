@@ -9,15 +9,128 @@ All balance changes go through this service to ensure:
 """
 
 import logging
+import uuid
+from dataclasses import dataclass
 from decimal import Decimal
-from django.db import transaction
+from django.conf import settings
+from django.db import DatabaseError, OperationalError, connection, transaction
+from django.db.models import Q
 from django.utils import timezone
 
 from apps.wallets.models import Currency, Balance, LedgerEntry, Deposit, Withdrawal
+from apps.wallets.services.balance_cache import invalidate_cached_balance
 from apps.accounts.models import User
 
 logger = logging.getLogger('apps.wallets')
 
+# Columns touched by a balance mutation. Rows are always locked before they
+# are mutated, so writing back only these fields is safe.
+BALANCE_UPDATE_FIELDS = ['available', 'locked', 'version', 'updated_at']
+
+# Columns loaded for a balance mutation - everything else is deferred.
+BALANCE_LOAD_FIELDS = ('id', 'user', 'currency', 'available', 'locked', 'version')
+
+
+def _as_decimal(value) -> Decimal:
+    """Coerce value to Decimal, skipping the str() round-trip for Decimals."""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+# SQLSTATEs worth retrying: deadlock_detected, serialization_failure.
+RETRYABLE_SQLSTATES = {'40P01', '40001'}
+MAX_LOCK_RETRIES = 3
+
+# Columns a guarded balance update may check against.
+GUARD_COLUMNS = ('available', 'locked')
+
+
+def _guarded_update_sql(guard: str, placeholders: list[str]) -> str:
+    """
+    UPDATE ... RETURNING used by LedgerService._guarded_update.
+
+    Placeholders are, in order: available delta, locked delta, user id,
+    currency id, required amount.
+    """
+    available_delta, locked_delta, user_id, currency_id, amount = placeholders
+    return (
+        f"UPDATE {Balance._meta.db_table} "
+        f"SET available = available + {available_delta}, locked = locked + {locked_delta}, "
+        f"version = version + 1, updated_at = NOW() "
+        f"WHERE user_id = {user_id} AND currency_id = {currency_id} AND {guard} >= {amount} "
+        f"RETURNING id, available, locked, version"
+    )
+
+
+# Create-or-lock a balance row in one round-trip. The no-op DO UPDATE
+# takes the row lock and makes RETURNING yield existing rows too;
+# xmax = 0 only for a freshly inserted row.
+ENSURE_BALANCE_SQL = (
+    f"INSERT INTO {Balance._meta.db_table} "
+    f"(id, user_id, currency_id, available, locked, version, created_at, updated_at) "
+    f"VALUES (%s, %s, %s, 0, 0, 1, NOW(), NOW()) "
+    f"ON CONFLICT (user_id, currency_id) "
+    f"DO UPDATE SET version = {Balance._meta.db_table}.version "
+    f"RETURNING id, available, locked, version, (xmax = 0)"
+)
+
+
+def _prepared_statement_name(guard: str) -> str:
+    return f'ledger_guarded_update_{guard}'
+
+
+def _ledger_statements_prepared() -> bool:
+    """
+    PREPARE the guarded balance updates on first use in each PostgreSQL
+    session, so later ledger calls skip parsing and planning.
+
+    Returns False when prepared statements are disabled or PREPARE failed;
+    callers then run the plain parameterised UPDATE.
+    """
+    if not settings.EXCHANGE_CONFIG.get('LEDGER_PREPARED_STATEMENTS', False):
+        return False
+
+    # Keyed on the DB-API connection: a reconnect starts a new session
+    # without the statements
+    connection.ensure_connection()
+    session = connection.connection
+    state = getattr(connection, 'ledger_statements_state', None)
+    if state is not None and state[0] is session:
+        return state[1]
+
+    try:
+        # Savepoint, so a failed PREPARE does not abort the caller's transaction
+        with transaction.atomic(), connection.cursor() as cursor:
+            for guard in GUARD_COLUMNS:
+                cursor.execute(
+                    f"PREPARE {_prepared_statement_name(guard)} AS "
+                    + _guarded_update_sql(guard, ['$1', '$2', '$3', '$4', '$5'])
+                )
+        prepared = True
+    except DatabaseError as e:
+        logger.warning("Ledger prepared statements unavailable: %s", e)
+        prepared = False
+
+    connection.ledger_statements_state = (session, prepared)
+    return prepared
+
+
+@dataclass
+class LedgerMutation:
+    """
+    A single balance change to be applied by LedgerService.apply_batch().
+
+    kind is one of: 'credit', 'debit', 'lock', 'unlock', 'deduct_locked'.
+    """
+    user: User
+    currency: Currency
+    kind: str
+    amount: Decimal
+    entry_type: str = None
+    description: str = None
+    reference_type: str = None
+    reference_id: str = None
+    created_by: User = None
+
 
 class LedgerService:
     """
@@ -27,6 +140,20 @@ class LedgerService:
     the blockchain directly. All operations are off-chain database updates.
     """
 
+    @staticmethod
+    def _select_balances_for_update():
+        """
+        Balance queryset with a row lock scoped to the balance rows only.
+
+        On PostgreSQL this is FOR NO KEY UPDATE OF the balance table, which
+        does not conflict with the KEY SHARE locks taken by FK checks and
+        never locks joined user/currency rows. Other backends fall back to
+        a plain FOR UPDATE.
+        """
+        if connection.vendor == 'postgresql':
+            return Balance.objects.select_for_update(of=('self',), no_key=True)
+        return Balance.objects.select_for_update()
+
     @staticmethod
     @transaction.atomic
     def get_or_create_balance(user: User, currency: Currency) -> Balance:
@@ -40,17 +167,420 @@ class LedgerService:
         Returns:
             Balance object
         """
-        balance, created = Balance.objects.select_for_update().get_or_create(
-            user=user,
-            currency=currency,
-            defaults={'available': Decimal('0'), 'locked': Decimal('0')}
-        )
+        return LedgerService._get_or_create_balance(user, currency)
+
+    @staticmethod
+    def _get_or_create_balance(user: User, currency: Currency) -> Balance:
+        """
+        get_or_create_balance() without its own atomic block.
+
+        On PostgreSQL this is a single INSERT ... ON CONFLICT statement
+        (see ENSURE_BALANCE_SQL) instead of a locked SELECT followed by an
+        INSERT.
+        """
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(ENSURE_BALANCE_SQL, [uuid.uuid4(), user.pk, currency.pk])
+                *row, created = cursor.fetchone()
+            balance = Balance.from_db(
+                connection.alias, ['id', 'available', 'locked', 'version'], row
+            )
+        else:
+            balance, created = LedgerService._select_balances_for_update().only(
+                *BALANCE_LOAD_FIELDS
+            ).get_or_create(
+                user=user,
+                currency=currency,
+                defaults={'available': Decimal('0'), 'locked': Decimal('0')}
+            )
 
         if created:
-            logger.info(f"Created new balance for {user.email} - {currency.symbol}")
+            logger.info("Created new balance for %s - %s", user.email, currency.symbol)
+
+        # Reuse the caller's objects so balance.user/balance.currency never lazy-load
+        balance.user = user
+        balance.currency = currency
 
         return balance
 
+    @staticmethod
+    def run_atomic_with_retry(func, attempts: int = MAX_LOCK_RETRIES):
+        """
+        Run func() in its own transaction.atomic() block, retrying it when
+        the database aborts it with a deadlock or serialization failure.
+
+        Args:
+            func: Callable performing the locked work; must be safe to re-run
+            attempts: Maximum number of tries
+
+        Returns:
+            Whatever func() returns
+        """
+        for attempt in range(1, attempts + 1):
+            try:
+                with transaction.atomic():
+                    return func()
+            except OperationalError as e:
+                sqlstate = getattr(e.__cause__, 'pgcode', None)
+                if sqlstate not in RETRYABLE_SQLSTATES or attempt == attempts:
+                    raise
+                logger.warning(
+                    "Retrying ledger transaction after SQLSTATE %s (attempt %s/%s)",
+                    sqlstate, attempt, attempts
+                )
+
+    @staticmethod
+    def _lock_balances(query: Q) -> dict:
+        """
+        Lock all balances matching query in a stable (id) order.
+
+        Returns:
+            Dict mapping (user_id, currency_id) to Balance
+        """
+        balances = LedgerService._select_balances_for_update().only(
+            *BALANCE_LOAD_FIELDS
+        ).filter(query).order_by('id')
+        return {(b.user_id, b.currency_id): b for b in balances}
+
+    @staticmethod
+    def lock_balances(pairs: list[tuple[User, Currency]]) -> dict:
+        """
+        Lock the balances for several (user, currency) pairs at once,
+        creating any that do not exist yet.
+
+        All rows are locked by a single SELECT FOR UPDATE in ascending id
+        order, so transactions that need overlapping balances queue on the
+        same first row instead of deadlocking. Must be called inside
+        transaction.atomic().
+
+        Args:
+            pairs: List of (User, Currency) tuples
+
+        Returns:
+            Dict mapping (user_id, currency_id) to the locked Balance
+        """
+        related = {(user.pk, currency.pk): (user, currency) for user, currency in pairs}
+        keys = set(related)
+        query = Q()
+        for user_id, currency_id in keys:
+            query |= Q(user_id=user_id, currency_id=currency_id)
+
+        balances = LedgerService._lock_balances(query)
+        missing = keys - balances.keys()
+        if missing:
+            Balance.objects.bulk_create(
+                [
+                    Balance(user_id=user_id, currency_id=currency_id)
+                    for user_id, currency_id in missing
+                ],
+                ignore_conflicts=True
+            )
+            balances = LedgerService._lock_balances(query)
+
+        # Reuse the caller's objects so balance.user/balance.currency never lazy-load
+        for key, balance in balances.items():
+            balance.user, balance.currency = related[key]
+
+        return balances
+
+    @staticmethod
+    def _guarded_update(
+            user: User,
+            currency: Currency,
+            guard: str,
+            amount: Decimal,
+            available_delta: Decimal = Decimal('0'),
+            locked_delta: Decimal = Decimal('0')
+    ):
+        """
+        Apply a balance delta only if balance.<guard> >= amount.
+
+        On PostgreSQL the check and the write are a single
+        UPDATE ... WHERE <guard> >= amount RETURNING statement, so the row
+        lock is held only for that statement. It runs as a prepared
+        statement when LEDGER_PREPARED_STATEMENTS is on (prepared on first
+        use per session). Other backends lock the row,
+        check it and save it.
+
+        Args:
+            user: User
+            currency: Currency
+            guard: 'available' or 'locked' - the column that must cover amount
+            amount: Amount that must be covered
+            available_delta: Change to apply to available
+            locked_delta: Change to apply to locked
+
+        Returns:
+            The updated Balance, or None if it is missing or insufficient
+        """
+        if guard not in GUARD_COLUMNS:
+            raise ValueError(f"Invalid guard column: {guard}")
+
+        if connection.vendor != 'postgresql':
+            balance = LedgerService._get_or_create_balance(user, currency)
+            if getattr(balance, guard) < amount:
+                return None
+            balance.available += available_delta
+            balance.locked += locked_delta
+            balance.version += 1
+            balance.save(update_fields=BALANCE_UPDATE_FIELDS)
+            invalidate_cached_balance(balance.user_id, balance.currency_id)
+            return balance
+
+        params = [available_delta, locked_delta, user.pk, currency.pk, amount]
+        prepared = _ledger_statements_prepared()
+        with connection.cursor() as cursor:
+            if prepared:
+                cursor.execute(
+                    f"EXECUTE {_prepared_statement_name(guard)} (%s, %s, %s, %s, %s)",
+                    params
+                )
+            else:
+                cursor.execute(_guarded_update_sql(guard, ['%s'] * 5), params)
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        balance = Balance.from_db(
+            connection.alias, ['id', 'available', 'locked', 'version'], row
+        )
+        balance.user = user
+        balance.currency = currency
+        invalidate_cached_balance(user.pk, currency.pk)
+        return balance
+
+    @staticmethod
+    def _credit_available(user: User, currency: Currency, amount: Decimal) -> Balance:
+        """
+        Add amount to balance.available with a single guarded UPDATE,
+        creating the balance row first if it does not exist yet.
+        """
+        balance = LedgerService._guarded_update(
+            user, currency, 'available', Decimal('0'), available_delta=amount
+        )
+        if balance is None:
+            Balance.objects.bulk_create(
+                [Balance(user=user, currency=currency)],
+                ignore_conflicts=True
+            )
+            balance = LedgerService._guarded_update(
+                user, currency, 'available', Decimal('0'), available_delta=amount
+            )
+        return balance
+
+    @staticmethod
+    def transfer_available(
+            sender: User,
+            recipient: User,
+            currency: Currency,
+            amount: Decimal
+    ) -> tuple[Balance, Balance]:
+        """
+        Move available balance from one user to another.
+
+        Both sides are guarded UPDATEs, applied in user id order so that
+        opposite transfers between the same users cannot deadlock. Must be
+        called inside transaction.atomic() - a failed debit leaves an
+        already applied credit to be rolled back.
+
+        Args:
+            sender: User to debit
+            recipient: User to credit
+            currency: Currency to move
+            amount: Amount to move (must be positive)
+
+        Returns:
+            Tuple of (sender Balance, recipient Balance) after the move
+
+        Raises:
+            ValueError: If sender and recipient are the same user, amount is not
+                positive or the sender's available balance is insufficient
+        """
+        if sender.pk == recipient.pk:
+            raise ValueError("Cannot transfer to yourself")
+
+        amount = _as_decimal(amount)
+
+        if amount <= 0:
+            raise ValueError("Transfer amount must be positive")
+
+        balances = {}
+        for user in sorted((sender, recipient), key=lambda u: u.pk):
+            if user.pk == recipient.pk:
+                balances[user.pk] = LedgerService._credit_available(user, currency, amount)
+                continue
+
+            balance = LedgerService._guarded_update(
+                user, currency, 'available', amount, available_delta=-amount
+            )
+            if balance is None:
+                available = LedgerService._current_balance_value(user, currency, 'available')
+                raise ValueError(
+                    f"Insufficient balance. Available: {available}, "
+                    f"Required: {amount}"
+                )
+            balances[user.pk] = balance
+
+        return balances[sender.pk], balances[recipient.pk]
+
+    @staticmethod
+    def _current_balance_value(user: User, currency: Currency, field: str) -> Decimal:
+        """Read one balance column (0 if the row does not exist) for error messages."""
+        value = Balance.objects.filter(
+            user=user, currency=currency
+        ).values_list(field, flat=True).first()
+        return value if value is not None else Decimal('0')
+
+    @staticmethod
+    def _mutate_balance(balance: Balance, mutation: LedgerMutation) -> LedgerEntry:
+        """
+        Apply a mutation to an already-locked balance in memory.
+
+        Neither the balance nor the returned (unsaved) LedgerEntry is
+        written - the caller persists and logs both.
+
+        Raises:
+            ValueError: If the amount is not positive or the balance is insufficient
+        """
+        amount = _as_decimal(mutation.amount)
+
+        if amount <= 0:
+            raise ValueError("Mutation amount must be positive")
+
+        entry_type = mutation.entry_type
+        description = mutation.description
+
+        if mutation.kind == 'credit':
+            balance_before = balance.available
+            balance.available += amount
+            balance_after = balance.available
+            entry_amount = amount
+        elif mutation.kind == 'debit':
+            if balance.available < amount:
+                raise ValueError(
+                    f"Insufficient balance. Available: {balance.available}, "
+                    f"Required: {amount}"
+                )
+            balance_before = balance.available
+            balance.available -= amount
+            balance_after = balance.available
+            entry_amount = -amount
+        elif mutation.kind == 'lock':
+            if balance.available < amount:
+                raise ValueError(
+                    f"Insufficient available balance. Available: {balance.available}, "
+                    f"Required: {amount}"
+                )
+            balance_before = balance.available
+            balance.available -= amount
+            balance.locked += amount
+            balance_after = balance.available
+            entry_amount = -amount
+            entry_type = entry_type or 'order_lock'
+            description = description or "Locked for order"
+        elif mutation.kind == 'unlock':
+            if balance.locked < amount:
+                raise ValueError(
+                    f"Insufficient locked balance. Locked: {balance.locked}, "
+                    f"Required: {amount}"
+                )
+            balance_before = balance.available
+            balance.locked -= amount
+            balance.available += amount
+            balance_after = balance.available
+            entry_amount = amount
+            entry_type = entry_type or 'order_unlock'
+            description = description or "Unlocked from cancelled order"
+        elif mutation.kind == 'deduct_locked':
+            if balance.locked < amount:
+                raise ValueError(
+                    f"Insufficient locked balance. Locked: {balance.locked}, "
+                    f"Required: {amount}"
+                )
+            balance_before = balance.total
+            balance.locked -= amount
+            balance_after = balance_before - amount
+            entry_amount = -amount
+            description = description or "Deducted from locked balance"
+        else:
+            raise ValueError(f"Unknown mutation kind: {mutation.kind}")
+
+        balance.version += 1
+
+        return LedgerEntry(
+            user=mutation.user,
+            currency=mutation.currency,
+            entry_type=entry_type,
+            amount=entry_amount,
+            balance_before=balance_before,
+            balance_after=balance_after,
+            description=description,
+            reference_type=mutation.reference_type,
+            reference_id=mutation.reference_id,
+            created_by=mutation.created_by
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def apply_batch(mutations: list[LedgerMutation]) -> list[tuple[Balance, LedgerEntry]]:
+        """
+        Apply several balance mutations with a single lock, one bulk UPDATE
+        and one bulk INSERT of ledger entries.
+
+        Balances are locked in id order so concurrent batches touching the
+        same rows cannot deadlock. Either every mutation is applied or none.
+
+        Args:
+            mutations: List of LedgerMutation objects, applied in order
+
+        Returns:
+            List of (Balance, LedgerEntry) tuples, one per mutation
+
+        Raises:
+            ValueError: If an amount is not positive or a balance is insufficient
+        """
+        return LedgerService._apply_batch(mutations)
+
+    @staticmethod
+    def _apply_batch(mutations: list[LedgerMutation]) -> list[tuple[Balance, LedgerEntry]]:
+        """apply_batch() without its own atomic block."""
+        if not mutations:
+            return []
+
+        balances = LedgerService.lock_balances(
+            [(mutation.user, mutation.currency) for mutation in mutations]
+        )
+
+        now = timezone.now()
+        results = []
+
+        for mutation in mutations:
+            balance = balances[(mutation.user.pk, mutation.currency.pk)]
+            ledger_entry = LedgerService._mutate_balance(balance, mutation)
+            balance.updated_at = now
+            results.append((balance, ledger_entry))
+
+            logger.info(
+                "Batch %s %s %s for %s. Available: %s, Locked: %s",
+                mutation.kind, mutation.amount, mutation.currency.symbol,
+                mutation.user.email, balance.available, balance.locked
+            )
+
+        touched = {id(balance): balance for balance, _ in results}
+        Balance.objects.bulk_update(
+            list(touched.values()),
+            BALANCE_UPDATE_FIELDS
+        )
+        for balance in touched.values():
+            invalidate_cached_balance(balance.user_id, balance.currency_id)
+        LedgerEntry.objects.bulk_create(
+            [ledger_entry for _, ledger_entry in results],
+            batch_size=500
+        )
+
+        return results
+
     @staticmethod
     @transaction.atomic
     def credit_balance(
@@ -79,21 +609,39 @@ class LedgerService:
         Returns:
             Tuple of (Balance, LedgerEntry)
         """
-        amount = Decimal(str(amount))
+        return LedgerService._credit_balance(
+            user=user,
+            currency=currency,
+            amount=amount,
+            entry_type=entry_type,
+            description=description,
+            reference_type=reference_type,
+            reference_id=reference_id,
+            created_by=created_by
+        )
+
+    @staticmethod
+    def _credit_balance(
+            user: User,
+            currency: Currency,
+            amount: Decimal,
+            entry_type: str,
+            description: str = None,
+            reference_type: str = None,
+            reference_id: str = None,
+            created_by: User = None
+    ) -> tuple[Balance, LedgerEntry]:
+        """credit_balance() without its own atomic block."""
+        amount = _as_decimal(amount)
 
         if amount <= 0:
             raise ValueError("Credit amount must be positive")
 
-        # Get or create balance with lock
-        balance = LedgerService.get_or_create_balance(user, currency)
+        # Update balance in one statement
+        balance = LedgerService._credit_available(user, currency, amount)
 
         # Record before state
-        balance_before = balance.available
-
-        # Update balance
-        balance.available += amount
-        balance.version += 1
-        balance.save()
+        balance_before = balance.available - amount
 
         # Create ledger entry
         ledger_entry = LedgerEntry.objects.create(
@@ -110,8 +658,8 @@ class LedgerService:
         )
 
         logger.info(
-            f"Credited {amount} {currency.symbol} to {user.email}. "
-            f"Balance: {balance_before} -> {balance.available}"
+            "Credited %s %s to %s. Balance: %s -> %s",
+            amount, currency.symbol, user.email, balance_before, balance.available
         )
 
         return balance, ledger_entry
@@ -147,27 +695,48 @@ class LedgerService:
         Raises:
             ValueError: If insufficient balance
         """
-        amount = Decimal(str(amount))
+        return LedgerService._debit_balance(
+            user=user,
+            currency=currency,
+            amount=amount,
+            entry_type=entry_type,
+            description=description,
+            reference_type=reference_type,
+            reference_id=reference_id,
+            created_by=created_by
+        )
+
+    @staticmethod
+    def _debit_balance(
+            user: User,
+            currency: Currency,
+            amount: Decimal,
+            entry_type: str,
+            description: str = None,
+            reference_type: str = None,
+            reference_id: str = None,
+            created_by: User = None
+    ) -> tuple[Balance, LedgerEntry]:
+        """debit_balance() without its own atomic block."""
+        amount = _as_decimal(amount)
 
         if amount <= 0:
             raise ValueError("Debit amount must be positive")
 
-        # Get balance with lock
-        balance = LedgerService.get_or_create_balance(user, currency)
+        # Check and update balance in one statement
+        balance = LedgerService._guarded_update(
+            user, currency, 'available', amount, available_delta=-amount
+        )
 
-        if balance.available < amount:
+        if balance is None:
+            available = LedgerService._current_balance_value(user, currency, 'available')
             raise ValueError(
-                f"Insufficient balance. Available: {balance.available}, "
+                f"Insufficient balance. Available: {available}, "
                 f"Required: {amount}"
             )
 
         # Record before state
-        balance_before = balance.available
-
-        # Update balance
-        balance.available -= amount
-        balance.version += 1
-        balance.save()
+        balance_before = balance.available + amount
 
         # Create ledger entry (negative amount for debit)
         ledger_entry = LedgerEntry.objects.create(
@@ -184,8 +753,8 @@ class LedgerService:
         )
 
         logger.info(
-            f"Debited {amount} {currency.symbol} from {user.email}. "
-            f"Balance: {balance_before} -> {balance.available}"
+            "Debited %s %s from %s. Balance: %s -> %s",
+            amount, currency.symbol, user.email, balance_before, balance.available
         )
 
         return balance, ledger_entry
@@ -212,25 +781,24 @@ class LedgerService:
         Returns:
             Tuple of (Balance, LedgerEntry)
         """
-        amount = Decimal(str(amount))
+        amount = _as_decimal(amount)
 
         if amount <= 0:
             raise ValueError("Lock amount must be positive")
 
-        balance = LedgerService.get_or_create_balance(user, currency)
+        balance = LedgerService._guarded_update(
+            user, currency, 'available', amount,
+            available_delta=-amount, locked_delta=amount
+        )
 
-        if balance.available < amount:
+        if balance is None:
+            available = LedgerService._current_balance_value(user, currency, 'available')
             raise ValueError(
-                f"Insufficient available balance. Available: {balance.available}, "
+                f"Insufficient available balance. Available: {available}, "
                 f"Required: {amount}"
             )
 
-        balance_before = balance.available
-
-        balance.available -= amount
-        balance.locked += amount
-        balance.version += 1
-        balance.save()
+        balance_before = balance.available + amount
 
         ledger_entry = LedgerEntry.objects.create(
             user=user,
@@ -245,8 +813,8 @@ class LedgerService:
         )
 
         logger.info(
-            f"Locked {amount} {currency.symbol} for {user.email}. "
-            f"Available: {balance.available}, Locked: {balance.locked}"
+            "Locked %s %s for %s. Available: %s, Locked: %s",
+            amount, currency.symbol, user.email, balance.available, balance.locked
         )
 
         return balance, ledger_entry
@@ -274,12 +842,12 @@ class LedgerService:
         Returns:
             Tuple of (Balance, LedgerEntry)
         """
-        amount = Decimal(str(amount))
+        amount = _as_decimal(amount)
 
         if amount <= 0:
             raise ValueError("Unlock amount must be positive")
 
-        balance = LedgerService.get_or_create_balance(user, currency)
+        balance = LedgerService._get_or_create_balance(user, currency)
 
         if balance.locked < amount:
             raise ValueError(
@@ -292,7 +860,8 @@ class LedgerService:
         balance.locked -= amount
         balance.available += amount
         balance.version += 1
-        balance.save()
+        balance.save(update_fields=BALANCE_UPDATE_FIELDS)
+        invalidate_cached_balance(balance.user_id, balance.currency_id)
 
         ledger_entry = LedgerEntry.objects.create(
             user=user,
@@ -307,8 +876,8 @@ class LedgerService:
         )
 
         logger.info(
-            f"Unlocked {amount} {currency.symbol} for {user.email}. "
-            f"Available: {balance.available}, Locked: {balance.locked}"
+            "Unlocked %s %s for %s. Available: %s, Locked: %s",
+            amount, currency.symbol, user.email, balance.available, balance.locked
         )
 
         return balance, ledger_entry
@@ -337,24 +906,24 @@ class LedgerService:
         Returns:
             Tuple of (Balance, LedgerEntry)
         """
-        amount = Decimal(str(amount))
+        amount = _as_decimal(amount)
 
         if amount <= 0:
             raise ValueError("Deduct amount must be positive")
 
-        balance = LedgerService.get_or_create_balance(user, currency)
+        balance = LedgerService._guarded_update(
+            user, currency, 'locked', amount, locked_delta=-amount
+        )
 
-        if balance.locked < amount:
+        if balance is None:
+            locked = LedgerService._current_balance_value(user, currency, 'locked')
             raise ValueError(
-                f"Insufficient locked balance. Locked: {balance.locked}, "
+                f"Insufficient locked balance. Locked: {locked}, "
                 f"Required: {amount}"
             )
 
-        balance_before = balance.total
-
-        balance.locked -= amount
-        balance.version += 1
-        balance.save()
+        balance_after = balance.total
+        balance_before = balance_after + amount
 
         ledger_entry = LedgerEntry.objects.create(
             user=user,
@@ -362,15 +931,15 @@ class LedgerService:
             entry_type=entry_type,
             amount=-amount,
             balance_before=balance_before,
-            balance_after=balance.total,
+            balance_after=balance_after,
             description=f"Deducted from locked balance",
             reference_type=reference_type,
             reference_id=reference_id
         )
 
         logger.info(
-            f"Deducted {amount} {currency.symbol} from locked for {user.email}. "
-            f"Total: {balance.total}"
+            "Deducted %s %s from locked for %s. Total: %s",
+            amount, currency.symbol, user.email, balance_after
         )
 
         return balance, ledger_entry
@@ -394,24 +963,32 @@ class LedgerService:
             raise ValueError("Deposit does not have enough confirmations")
 
         # Credit balance
-        balance, ledger_entry = LedgerService.credit_balance(
-            user=deposit.user,
-            currency=deposit.currency,
-            amount=deposit.amount,
-            entry_type='deposit',
-            description=f"Deposit from {deposit.from_address[:10]}...",
-            reference_type='deposit',
-            reference_id=str(deposit.id)
-        )
+        [(balance, ledger_entry)] = LedgerService._apply_batch([
+            LedgerMutation(
+                user=deposit.user,
+                currency=deposit.currency,
+                kind='credit',
+                amount=deposit.amount,
+                entry_type='deposit',
+                description=f"Deposit from {deposit.from_address[:10]}...",
+                reference_type='deposit',
+                reference_id=str(deposit.id)
+            )
+        ])
 
         # Update deposit status
         deposit.status = 'completed'
         deposit.credited_at = timezone.now()
         deposit.save()
 
+        # Notify the user only once the credit is committed
+        from apps.wallets.tasks import notify_deposit_confirmed
+        deposit_id = str(deposit.id)
+        transaction.on_commit(lambda: notify_deposit_confirmed.delay(deposit_id))
+
         logger.info(
-            f"Processed deposit {deposit.id}: {deposit.amount} {deposit.currency.symbol} "
-            f"for {deposit.user.email}"
+            "Processed deposit %s: %s %s for %s",
+            deposit.id, deposit.amount, deposit.currency.symbol, deposit.user.email
         )
 
         return balance, ledger_entry
@@ -436,12 +1013,12 @@ class LedgerService:
         Returns:
             Withdrawal object
         """
-        amount = Decimal(str(amount))
-        fee = currency.withdrawal_fee
+        amount = _as_decimal(amount)
+        fee = _as_decimal(currency.withdrawal_fee)
         total_debit = amount + fee
 
-        # Check balance
-        balance = LedgerService.get_or_create_balance(user, currency)
+        # Lock balance once, check it, then debit in place
+        balance = LedgerService._get_or_create_balance(user, currency)
 
         if balance.available < total_debit:
             raise ValueError(
@@ -449,14 +1026,17 @@ class LedgerService:
                 f"Required: {total_debit} (amount: {amount}, fee: {fee})"
             )
 
-        # Debit balance
-        LedgerService.debit_balance(
+        ledger_entry = LedgerService._mutate_balance(balance, LedgerMutation(
             user=user,
             currency=currency,
+            kind='debit',
             amount=total_debit,
             entry_type='withdrawal',
             description=f"Withdrawal to {to_address[:10]}..."
-        )
+        ))
+        balance.save(update_fields=BALANCE_UPDATE_FIELDS)
+        invalidate_cached_balance(balance.user_id, balance.currency_id)
+        ledger_entry.save()
 
         # Create withdrawal record
         withdrawal = Withdrawal.objects.create(
@@ -468,9 +1048,14 @@ class LedgerService:
             chain_id=currency.chain_id
         )
 
+        # Notify the user only once the debit is committed
+        from apps.wallets.tasks import notify_withdrawal_requested
+        withdrawal_id = str(withdrawal.id)
+        transaction.on_commit(lambda: notify_withdrawal_requested.delay(withdrawal_id))
+
         logger.info(
-            f"Created withdrawal {withdrawal.id}: {amount} {currency.symbol} "
-            f"for {user.email} to {to_address[:10]}..."
+            "Created withdrawal %s: %s %s for %s to %s...",
+            withdrawal.id, amount, currency.symbol, user.email, to_address[:10]
         )
 
         return withdrawal
@@ -499,7 +1084,7 @@ class LedgerService:
         Returns:
             Tuple of (Balance, LedgerEntry)
         """
-        amount = Decimal(str(amount))
+        amount = _as_decimal(amount)
 
         if amount <= 0:
             raise ValueError("Adjustment amount must be positive")
@@ -507,28 +1092,35 @@ class LedgerService:
         if adjustment_type not in ['credit', 'debit']:
             raise ValueError("adjustment_type must be 'credit' or 'debit'")
 
-        if adjustment_type == 'credit':
-            balance, ledger_entry = LedgerService.credit_balance(
-                user=target_user,
-                currency=currency,
-                amount=amount,
-                entry_type='admin_credit',
-                description=f"Admin credit: {reason}",
-                created_by=admin_user
-            )
-        else:
-            balance, ledger_entry = LedgerService.debit_balance(
-                user=target_user,
-                currency=currency,
-                amount=amount,
-                entry_type='admin_debit',
-                description=f"Admin debit: {reason}",
-                created_by=admin_user
-            )
+        balance = LedgerService._get_or_create_balance(target_user, currency)
+
+        ledger_entry = LedgerService._mutate_balance(balance, LedgerMutation(
+            user=target_user,
+            currency=currency,
+            kind=adjustment_type,
+            amount=amount,
+            entry_type=f'admin_{adjustment_type}',
+            description=f"Admin {adjustment_type}: {reason}",
+            created_by=admin_user
+        ))
+        balance.save(update_fields=BALANCE_UPDATE_FIELDS)
+        invalidate_cached_balance(balance.user_id, balance.currency_id)
+        ledger_entry.save()
 
         logger.warning(
-            f"ADMIN BALANCE ADJUSTMENT: {admin_user.email} {adjustment_type}ed "
-            f"{amount} {currency.symbol} for {target_user.email}. Reason: {reason}"
+            "ADMIN BALANCE ADJUSTMENT: %s %sed %s %s for %s. Reason: %s",
+            admin_user.email, adjustment_type, amount, currency.symbol,
+            target_user.email, reason,
+            extra={
+                'admin_user_id': str(admin_user.pk),
+                'target_user_id': str(target_user.pk),
+                'currency': currency.symbol,
+                'adjustment_type': adjustment_type,
+                'amount': str(amount),
+                'balance_after': str(balance.available),
+                'reason': reason,
+                'ledger_entry_id': str(ledger_entry.id),
+            }
         )
 
         return balance, ledger_entry
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Wallets Celery Tasks
+====================
+Deposit and withdrawal post-processing that does not need to run inside
+the request or the balance transaction.
+"""
+
+import logging
+from celery import shared_task
+
+logger = logging.getLogger('apps.wallets')
+
+
+@shared_task(name='apps.wallets.tasks.notify_withdrawal_requested')
+def notify_withdrawal_requested(withdrawal_id: str):
+    """
+    Send the withdrawal requested email.
+    Queued by LedgerService.create_withdrawal once its transaction commits.
+    """
+    from apps.wallets.models import Withdrawal
+    from emails.notifications import notify_withdrawal_requested as send_notification
+
+    try:
+        withdrawal = Withdrawal.objects.select_related('user', 'currency').get(id=withdrawal_id)
+    except Withdrawal.DoesNotExist:
+        logger.warning("Withdrawal %s not found for notification", withdrawal_id)
+        return {'status': 'not_found'}
+
+    try:
+        send_notification(withdrawal.user, withdrawal)
+        logger.info("Withdrawal requested email sent to %s", withdrawal.user.email)
+    except Exception as e:
+        logger.error("Failed to send withdrawal requested email: %s", e)
+        return {'status': 'failed'}
+
+    return {'status': 'completed'}
+
+
+@shared_task(name='apps.wallets.tasks.notify_deposit_confirmed')
+def notify_deposit_confirmed(deposit_id: str):
+    """
+    Send the deposit confirmed email.
+    Queued by LedgerService.process_deposit once its transaction commits.
+    """
+    from apps.wallets.models import Deposit
+    from emails.notifications import notify_deposit_confirmed as send_notification
+
+    try:
+        deposit = Deposit.objects.select_related('user', 'currency').get(id=deposit_id)
+    except Deposit.DoesNotExist:
+        logger.warning("Deposit %s not found for notification", deposit_id)
+        return {'status': 'not_found'}
+
+    try:
+        send_notification(deposit.user, deposit)
+        logger.info("Deposit confirmed email sent to %s", deposit.user.email)
+    except Exception as e:
+        logger.error("Failed to send deposit confirmed email: %s", e)
+        return {'status': 'failed'}
+
+    return {'status': 'completed'}
+
+
+@shared_task(name='apps.wallets.tasks.execute_p2p_transfer')
+def execute_p2p_transfer(transfer_id: int):
+    """
+    Move funds for a pending P2PTransfer and mark it completed or failed.
+    Queued by the p2p_transfer view, so the balance updates run on a
+    worker instead of the request thread. The client polls the outcome
+    through get_transfer_status.
+    """
+    from apps.wallets.models import LedgerEntry, P2PTransfer
+    from apps.wallets.services.ledger import LedgerService
+
+    try:
+        transfer = P2PTransfer.objects.select_related(
+            'sender', 'recipient', 'currency'
+        ).get(id=transfer_id)
+    except P2PTransfer.DoesNotExist:
+        logger.warning("P2P transfer %s not found", transfer_id)
+        return {'status': 'not_found'}
+
+    sender, recipient = transfer.sender, transfer.recipient
+    currency, amount = transfer.currency, transfer.amount
+
+    # Built before the transaction so no Python work runs while rows are locked
+    send_description = f'P2P transfer to {recipient.email or recipient.username}'
+    receive_description = f'P2P transfer from {sender.email or sender.username}'
+
+    def perform_transfer():
+        # Claim the row so a redelivered task cannot move the funds twice
+        claimed = P2PTransfer.objects.filter(
+            id=transfer.id, status='pending'
+        ).update(status='completed')
+        if not claimed:
+            return False
+
+        # Check-and-move in the database; raises ValueError if insufficient
+        sender_balance, recipient_balance = LedgerService.transfer_available(
+            sender, recipient, currency, amount
+        )
+
+        # Create ledger entries for audit trail in one INSERT.
+        # P2PTransfer has an integer pk, which does not fit
+        # LedgerEntry.reference_id (UUID), so only the type is recorded.
+        LedgerEntry.objects.bulk_create([
+            LedgerEntry(
+                user=sender,
+                currency=currency,
+                entry_type='p2p_send',
+                amount=-amount,
+                balance_before=sender_balance.available + amount,
+                balance_after=sender_balance.available,
+                reference_type='p2p_transfer',
+                description=send_description
+            ),
+            LedgerEntry(
+                user=recipient,
+                currency=currency,
+                entry_type='p2p_receive',
+                amount=amount,
+                balance_before=recipient_balance.available - amount,
+                balance_after=recipient_balance.available,
+                reference_type='p2p_transfer',
+                description=receive_description
+            ),
+        ])
+
+        return True
+
+    # Perform transfer atomically, retrying on deadlock
+    try:
+        performed = LedgerService.run_atomic_with_retry(perform_transfer)
+    except ValueError as e:
+        # The rollback left the row pending; record why it was refused
+        P2PTransfer.objects.filter(id=transfer.id, status='pending').update(
+            status='failed', failure_reason=str(e)[:255]
+        )
+        logger.info("P2P transfer %s from %s failed: %s", transfer.id, sender.email, e)
+        return {'status': 'failed', 'error': str(e)}
+
+    if not performed:
+        logger.info("P2P transfer %s already processed", transfer.id)
+        return {'status': 'skipped'}
+
+    logger.info("P2P transfer %s: %s %s from %s", transfer.id, amount, currency.symbol, sender.email)
+    return {'status': 'completed', 'transfer_id': transfer.id}
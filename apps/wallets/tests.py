@@ -0,0 +1,260 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.accounts.models import User
+from apps.wallets.models import Balance, Currency, LedgerEntry, P2PTransfer, Withdrawal
+from apps.wallets.services.balance_cache import get_cached_balance
+from apps.wallets.services.currency_cache import clear_currency_cache, get_currency
+from apps.wallets.services.ledger import LedgerMutation, LedgerService
+from apps.wallets.views import WithdrawalCancelView, get_transfer_status, p2p_transfer
+
+WITHDRAWAL_ADDRESS = '0x' + 'a' * 40
+
+
+class LedgerTestCase(TestCase):
+    """Two users and one currency, with helpers for funding and reading balances"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Cache invalidation waits for a commit, which TestCase never makes
+        cache.clear()
+        clear_currency_cache()
+        cls.alice = User.objects.create_user(email='alice@test.com', username='alice', password='x')
+        cls.bob = User.objects.create_user(email='bob@test.com', username='bob', password='x')
+        cls.currency = Currency.objects.create(
+            symbol='TST', name='Test Token', withdrawal_fee=Decimal('0.5')
+        )
+
+    def fund(self, user, amount):
+        LedgerService.credit_balance(user, self.currency, Decimal(amount), entry_type='deposit')
+
+    def balance(self, user):
+        return Balance.objects.get(user=user, currency=self.currency)
+
+
+class CurrencyCacheTests(LedgerTestCase):
+
+    def test_cached_currency_is_dropped_on_commit(self):
+        self.assertEqual(get_currency('TST').name, 'Test Token')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.currency.name = 'Renamed Token'
+            self.currency.save()
+            self.assertEqual(get_currency('TST').name, 'Test Token')
+
+        self.assertEqual(get_currency('TST').name, 'Renamed Token')
+
+
+class ApplyBatchTests(LedgerTestCase):
+
+    def test_multi_leg_batch_applies_every_mutation(self):
+        self.fund(self.alice, '10')
+
+        results = LedgerService.apply_batch([
+            LedgerMutation(self.alice, self.currency, 'lock', Decimal('4')),
+            LedgerMutation(self.alice, self.currency, 'deduct_locked', Decimal('3'), entry_type='trade'),
+            LedgerMutation(self.bob, self.currency, 'credit', Decimal('3'), entry_type='trade'),
+        ])
+
+        self.assertEqual(len(results), 3)
+        alice = self.balance(self.alice)
+        self.assertEqual(alice.available, Decimal('6'))
+        self.assertEqual(alice.locked, Decimal('1'))
+        self.assertEqual(self.balance(self.bob).available, Decimal('3'))
+        # One deposit entry plus one entry per mutation
+        self.assertEqual(LedgerEntry.objects.count(), 4)
+
+    def test_failing_leg_rolls_back_the_whole_batch(self):
+        self.fund(self.alice, '5')
+
+        with self.assertRaises(ValueError):
+            LedgerService.apply_batch([
+                LedgerMutation(self.bob, self.currency, 'credit', Decimal('5'), entry_type='trade'),
+                LedgerMutation(self.alice, self.currency, 'debit', Decimal('6'), entry_type='trade'),
+            ])
+
+        self.assertEqual(self.balance(self.alice).available, Decimal('5'))
+        self.assertFalse(Balance.objects.filter(user=self.bob, available__gt=0).exists())
+        self.assertEqual(LedgerEntry.objects.count(), 1)
+
+
+class GuardedDebitTests(LedgerTestCase):
+
+    def test_debit_within_balance(self):
+        self.fund(self.alice, '5')
+
+        balance, entry = LedgerService.debit_balance(
+            self.alice, self.currency, Decimal('2'), entry_type='withdrawal'
+        )
+
+        self.assertEqual(balance.available, Decimal('3'))
+        self.assertEqual(entry.amount, Decimal('-2'))
+        self.assertEqual(entry.balance_before, Decimal('5'))
+
+    def test_insufficient_balance_is_rejected(self):
+        self.fund(self.alice, '5')
+
+        with self.assertRaises(ValueError):
+            LedgerService.debit_balance(
+                self.alice, self.currency, Decimal('5.000001'), entry_type='withdrawal'
+            )
+
+        self.assertEqual(self.balance(self.alice).available, Decimal('5'))
+
+    def test_missing_balance_is_rejected(self):
+        with self.assertRaises(ValueError):
+            LedgerService.debit_balance(
+                self.bob, self.currency, Decimal('1'), entry_type='withdrawal'
+            )
+
+
+class TransferAvailableTests(LedgerTestCase):
+
+    def test_moves_funds_between_users(self):
+        self.fund(self.alice, '5')
+
+        sender, recipient = LedgerService.transfer_available(
+            self.alice, self.bob, self.currency, Decimal('2')
+        )
+
+        self.assertEqual(sender.available, Decimal('3'))
+        self.assertEqual(recipient.available, Decimal('2'))
+        self.assertEqual(self.balance(self.alice).available, Decimal('3'))
+        self.assertEqual(self.balance(self.bob).available, Decimal('2'))
+
+    def test_insufficient_balance_is_rejected(self):
+        self.fund(self.alice, '1')
+
+        with self.assertRaises(ValueError):
+            LedgerService.transfer_available(self.alice, self.bob, self.currency, Decimal('2'))
+
+    def test_non_positive_amount_is_rejected(self):
+        self.fund(self.alice, '1')
+
+        with self.assertRaises(ValueError):
+            LedgerService.transfer_available(self.alice, self.bob, self.currency, Decimal('0'))
+
+    def test_self_transfer_is_rejected(self):
+        self.fund(self.alice, '5')
+
+        with self.assertRaises(ValueError):
+            LedgerService.transfer_available(self.alice, self.alice, self.currency, Decimal('1'))
+
+        self.assertEqual(self.balance(self.alice).available, Decimal('5'))
+
+
+class WithdrawalTests(LedgerTestCase):
+
+    def cancel(self, withdrawal, user):
+        request = APIRequestFactory().post(f'/api/v1/wallets/withdrawals/{withdrawal.id}/cancel/')
+        force_authenticate(request, user=user)
+        return WithdrawalCancelView.as_view()(request, withdrawal_id=withdrawal.id)
+
+    def test_create_debits_amount_and_fee(self):
+        self.fund(self.alice, '10')
+
+        withdrawal = LedgerService.create_withdrawal(
+            self.alice, self.currency, WITHDRAWAL_ADDRESS, Decimal('4')
+        )
+
+        self.assertEqual(withdrawal.status, 'pending')
+        self.assertEqual(withdrawal.fee, Decimal('0.5'))
+        self.assertEqual(self.balance(self.alice).available, Decimal('5.5'))
+
+    def test_create_with_insufficient_balance_is_rejected(self):
+        self.fund(self.alice, '4')
+
+        with self.assertRaises(ValueError):
+            LedgerService.create_withdrawal(self.alice, self.currency, WITHDRAWAL_ADDRESS, Decimal('4'))
+
+        self.assertEqual(self.balance(self.alice).available, Decimal('4'))
+        self.assertFalse(Withdrawal.objects.exists())
+
+    def test_cancel_refunds_amount_and_fee(self):
+        self.fund(self.alice, '10')
+        withdrawal = LedgerService.create_withdrawal(
+            self.alice, self.currency, WITHDRAWAL_ADDRESS, Decimal('4')
+        )
+
+        response = self.cancel(withdrawal, self.alice)
+
+        self.assertEqual(response.status_code, 200)
+        withdrawal.refresh_from_db()
+        self.assertEqual(withdrawal.status, 'rejected')
+        self.assertEqual(self.balance(self.alice).available, Decimal('10'))
+
+    def test_second_cancel_does_not_refund_again(self):
+        self.fund(self.alice, '10')
+        withdrawal = LedgerService.create_withdrawal(
+            self.alice, self.currency, WITHDRAWAL_ADDRESS, Decimal('4')
+        )
+        self.cancel(withdrawal, self.alice)
+
+        response = self.cancel(withdrawal, self.alice)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.balance(self.alice).available, Decimal('10'))
+
+    def test_cannot_cancel_another_users_withdrawal(self):
+        self.fund(self.alice, '10')
+        withdrawal = LedgerService.create_withdrawal(
+            self.alice, self.currency, WITHDRAWAL_ADDRESS, Decimal('4')
+        )
+
+        response = self.cancel(withdrawal, self.bob)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.balance(self.alice).available, Decimal('5.5'))
+
+
+class P2PTransferTests(LedgerTestCase):
+
+    def submit(self, amount):
+        request = APIRequestFactory().post('/api/v1/wallets/p2p/', {
+            'currency_symbol': 'TST', 'recipient_username': 'bob', 'amount': amount
+        }, format='json')
+        force_authenticate(request, user=self.alice)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = p2p_transfer(request)
+        return response
+
+    def transfer_status(self, transfer_id, user):
+        request = APIRequestFactory().get(f'/api/v1/wallets/p2p/{transfer_id}/')
+        force_authenticate(request, user=user)
+        return get_transfer_status(request, transfer_id=transfer_id)
+
+    def test_completed_transfer_is_reported(self):
+        self.fund(self.alice, '5')
+
+        response = self.submit('2')
+
+        self.assertEqual(response.status_code, 202)
+        result = self.transfer_status(response.data['transfer']['id'], self.alice)
+        self.assertEqual(result.data['status'], 'completed')
+        self.assertIsNone(result.data['error'])
+        self.assertEqual(self.balance(self.bob).available, Decimal('2'))
+
+    def test_worker_rejection_is_reported(self):
+        self.fund(self.alice, '5')
+        # Spend the funds behind the cached balance the view checks
+        get_cached_balance(self.alice.id, self.currency.id)
+        Balance.objects.filter(user=self.alice, currency=self.currency).update(available=Decimal('1'))
+
+        response = self.submit('2')
+
+        self.assertEqual(response.status_code, 202)
+        result = self.transfer_status(response.data['transfer']['id'], self.alice)
+        self.assertEqual(result.data['status'], 'failed')
+        self.assertTrue(result.data['error'].startswith('Insufficient'))
+        self.assertFalse(Balance.objects.filter(user=self.bob, available__gt=0).exists())
+
+    def test_status_is_only_visible_to_the_sender(self):
+        transfer = P2PTransfer.objects.create(
+            sender=self.alice, recipient=self.bob, currency=self.currency,
+            amount=Decimal('1'), status='pending'
+        )
+
+        self.assertEqual(self.transfer_status(transfer.id, self.bob).status_code, 404)
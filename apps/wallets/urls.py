@@ -13,6 +13,9 @@ from .views import (
     WithdrawalCreateView,
     WithdrawalCancelView,
     AdminBalanceAdjustmentView,
+    p2p_transfer,
+    get_transfers,
+    get_transfer_status,
 )
 from .admin_views import (
     AdminBalanceAdjustmentView as AdminBalanceAdjustView,
@@ -48,6 +51,9 @@ urlpatterns = [
     path('transfer/', views_transfer.transfer_crypto, name='transfer-crypto'),
     path('transfer/qr/', views_transfer.get_transfer_qr_data, name='transfer-qr'),
     path('transfer/search/', views_transfer.search_users, name='transfer-search'),
+    path('p2p/', p2p_transfer, name='p2p_transfer'),
+    path('p2p/history/', get_transfers, name='p2p_transfer_list'),
+    path('p2p/<int:transfer_id>/', get_transfer_status, name='p2p_transfer_status'),
     
     # Admin endpoints
     path('admin/adjust-balance/', AdminBalanceAdjustView.as_view(), name='admin_adjust_balance'),
@@ -9,16 +9,20 @@ from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.conf import settings
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django.db import transaction
+from django.utils import timezone
+from django.db.models import (
+    DecimalField, ExpressionWrapper, F, FilteredRelation, Q, Value
+)
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from decimal import Decimal
-from .models import Balance, Currency, LedgerEntry
 
-from .models import Currency, Balance, LedgerEntry, Deposit, Withdrawal
+from .models import Currency, LedgerEntry, Deposit, Withdrawal, P2PTransfer
 from .serializers import (
     CurrencySerializer,
     BalanceSerializer,
@@ -30,9 +34,16 @@ from .serializers import (
     AdminBalanceAdjustmentSerializer,
 )
 from .services.ledger import LedgerService
+from .services.balance_cache import get_cached_balance
+from .services.currency_cache import get_currency, get_active_currencies
+from .services.deposit_address import get_deposit_address
+from .tasks import execute_p2p_transfer
+from .views_transfer import AMOUNT_RE
 
 logger = logging.getLogger(__name__)
 
+BALANCE_DECIMAL_FIELD = DecimalField(max_digits=36, decimal_places=18)
+
 
 # =============================================================================
 # CURRENCY ENDPOINTS
@@ -48,7 +59,7 @@ class CurrencyListView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Currency.objects.filter(is_active=True)
+        return list(get_active_currencies())
 
 
 # =============================================================================
@@ -64,35 +75,29 @@ class BalanceListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        balances = Balance.objects.filter(
-            user=request.user
-        ).select_related('currency')
-
-        existing_currencies = set(b.currency_id for b in balances)
-        active_currencies = Currency.objects.filter(is_active=True)
-
-        result = []
-
-        for balance in balances:
-            result.append({
-                'currency_symbol': balance.currency.symbol,
-                'currency_name': balance.currency.name,
-                'available': balance.available,
-                'locked': balance.locked,
-                'total': balance.total,
-            })
-
-        for currency in active_currencies:
-            if currency.id not in existing_currencies:
-                result.append({
-                    'currency_symbol': currency.symbol,
-                    'currency_name': currency.name,
-                    'available': '0',
-                    'locked': '0',
-                    'total': '0',
-                })
-
-        result.sort(key=lambda x: x['currency_symbol'])
+        # Active currencies plus any currency the user holds a balance in,
+        # LEFT JOINed to that user's balance and ordered by symbol in SQL
+        zero = Value(Decimal('0'), output_field=BALANCE_DECIMAL_FIELD)
+        result = Currency.objects.annotate(
+            user_balance=FilteredRelation(
+                'balances',
+                condition=Q(balances__user=request.user)
+            )
+        ).filter(
+            Q(is_active=True) | Q(user_balance__isnull=False)
+        ).annotate(
+            currency_symbol=F('symbol'),
+            currency_name=F('name'),
+            available=Coalesce('user_balance__available', zero),
+            locked=Coalesce('user_balance__locked', zero),
+        ).annotate(
+            total=ExpressionWrapper(
+                F('available') + F('locked'),
+                output_field=BALANCE_DECIMAL_FIELD
+            )
+        ).values(
+            'currency_symbol', 'currency_name', 'available', 'locked', 'total'
+        ).order_by('symbol')
 
         serializer = BalanceSummarySerializer(result, many=True)
         return Response(serializer.data)
@@ -108,24 +113,21 @@ class BalanceDetailView(APIView):
 
     def get(self, request, currency_symbol):
         try:
-            currency = Currency.objects.get(
-                symbol=currency_symbol.upper(),
-                is_active=True
-            )
+            currency = get_currency(currency_symbol)
         except Currency.DoesNotExist:
             return Response(
                 {'error': 'Currency not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        balance = LedgerService.get_or_create_balance(request.user, currency)
+        available, locked = get_cached_balance(request.user.id, currency.id)
 
         return Response({
             'currency_symbol': currency.symbol,
             'currency_name': currency.name,
-            'available': str(balance.available),
-            'locked': str(balance.locked),
-            'total': str(balance.total),
+            'available': str(available),
+            'locked': str(locked),
+            'total': str(available + locked),
         })
 
 
@@ -133,6 +135,14 @@ class BalanceDetailView(APIView):
 # LEDGER ENDPOINTS
 # =============================================================================
 
+class HistoryCursorPagination(CursorPagination):
+    """
+    Keyset pagination for per-user history, served by the
+    (user, -created_at) indexes - no COUNT(*) and no OFFSET scan.
+    """
+    ordering = '-created_at'
+
+
 class LedgerHistoryView(generics.ListAPIView):
     """
     GET /api/v1/wallets/ledger/
@@ -141,15 +151,24 @@ class LedgerHistoryView(generics.ListAPIView):
     """
     serializer_class = LedgerEntrySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HistoryCursorPagination
 
     def get_queryset(self):
         queryset = LedgerEntry.objects.filter(
             user=self.request.user
-        ).select_related('currency')
+        ).select_related('currency').only(
+            'id', 'currency__symbol', 'entry_type', 'amount',
+            'balance_before', 'balance_after', 'description',
+            'reference_type', 'reference_id', 'created_at'
+        )
 
         currency_symbol = self.request.query_params.get('currency')
         if currency_symbol:
-            queryset = queryset.filter(currency__symbol=currency_symbol.upper())
+            try:
+                currency = get_currency(currency_symbol, active_only=False)
+            except Currency.DoesNotExist:
+                return queryset.none()
+            queryset = queryset.filter(currency=currency)
 
         entry_type = self.request.query_params.get('type')
         if entry_type:
@@ -172,10 +191,7 @@ class DepositAddressView(APIView):
 
     def get(self, request, currency_symbol):
         try:
-            currency = Currency.objects.get(
-                symbol=currency_symbol.upper(),
-                is_active=True
-            )
+            currency = get_currency(currency_symbol)
         except Currency.DoesNotExist:
             return Response(
                 {'error': 'Currency not found'},
@@ -188,26 +204,7 @@ class DepositAddressView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        network_info = settings.BLOCKCHAIN_CONFIG['NETWORKS'].get(currency.chain_id, {})
-
-        deposit_address = "0xDEMO_DEPOSIT_ADDRESS_GENERATE_UNIQUE_PER_USER"
-
-        wallet = request.user.wallet_connections.filter(is_primary=True).first()
-        if wallet:
-            note = "Your connected wallet: " + wallet.wallet_address
-        else:
-            note = "Connect a wallet to see your address"
-
-        return Response({
-            'currency_symbol': currency.symbol,
-            'address': deposit_address,
-            'chain_id': currency.chain_id,
-            'network_name': network_info.get('name', 'Unknown Network'),
-            'min_deposit': str(currency.min_deposit),
-            'confirmations_required': settings.BLOCKCHAIN_CONFIG['MIN_CONFIRMATIONS'],
-            'note': note,
-            'warning': 'DEMO MODE: This is a test address. Do not send real funds!'
-        })
+        return Response(get_deposit_address(request.user, currency))
 
 
 class DepositHistoryView(generics.ListAPIView):
@@ -218,11 +215,16 @@ class DepositHistoryView(generics.ListAPIView):
     """
     serializer_class = DepositSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HistoryCursorPagination
 
     def get_queryset(self):
         return Deposit.objects.filter(
             user=self.request.user
-        ).select_related('currency').order_by('-created_at')
+        ).select_related('currency').only(
+            'id', 'currency__symbol', 'tx_hash', 'from_address',
+            'to_address', 'amount', 'confirmations', 'required_confirmations',
+            'status', 'block_number', 'chain_id', 'credited_at', 'created_at'
+        ).order_by('-created_at')
 
 
 # =============================================================================
@@ -237,11 +239,16 @@ class WithdrawalListView(generics.ListAPIView):
     """
     serializer_class = WithdrawalSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = HistoryCursorPagination
 
     def get_queryset(self):
         return Withdrawal.objects.filter(
             user=self.request.user
-        ).select_related('currency').order_by('-created_at')
+        ).select_related('currency').only(
+            'id', 'currency__symbol', 'to_address', 'amount', 'fee',
+            'tx_hash', 'status', 'rejection_reason',
+            'chain_id', 'created_at', 'processed_at'
+        ).order_by('-created_at')
 
 
 class WithdrawalCreateView(APIView):
@@ -264,14 +271,6 @@ class WithdrawalCreateView(APIView):
                 amount=serializer.validated_data['amount']
             )
 
-            # Send withdrawal requested email notification
-            try:
-                from emails.notifications import notify_withdrawal_requested
-                notify_withdrawal_requested(request.user, withdrawal)
-                logger.info(f"Withdrawal requested email sent to {request.user.email}")
-            except Exception as e:
-                logger.error(f"Failed to send withdrawal requested email: {e}")
-
             return Response({
                 'message': 'Withdrawal request created successfully',
                 'withdrawal': WithdrawalSerializer(withdrawal).data,
@@ -311,20 +310,37 @@ class WithdrawalCancelView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        total_refund = withdrawal.amount + withdrawal.fee
-        LedgerService.credit_balance(
-            user=request.user,
-            currency=withdrawal.currency,
-            amount=total_refund,
-            entry_type='withdrawal',
-            description='Cancelled withdrawal refund',
-            reference_type='withdrawal',
-            reference_id=str(withdrawal.id)
-        )
+        # Flip and refund together; production settings have no ATOMIC_REQUESTS
+        with transaction.atomic():
+            # Flip the status first so concurrent cancels cannot both refund
+            cancelled = Withdrawal.objects.filter(
+                id=withdrawal.id,
+                status='pending'
+            ).update(
+                status='rejected',
+                rejection_reason='Cancelled by user',
+                updated_at=timezone.now()
+            )
+            if not cancelled:
+                withdrawal.refresh_from_db(fields=['status'])
+                return Response(
+                    {'error': 'Cannot cancel withdrawal with status: ' + withdrawal.status},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            total_refund = withdrawal.amount + withdrawal.fee
+            LedgerService.credit_balance(
+                user=request.user,
+                currency=withdrawal.currency,
+                amount=total_refund,
+                entry_type='withdrawal',
+                description='Cancelled withdrawal refund',
+                reference_type='withdrawal',
+                reference_id=str(withdrawal.id)
+            )
 
         withdrawal.status = 'rejected'
         withdrawal.rejection_reason = 'Cancelled by user'
-        withdrawal.save()
 
         return Response({
             'message': 'Withdrawal cancelled successfully',
@@ -397,7 +413,7 @@ def p2p_transfer(request):
         currency_symbol = request.data.get('currency_symbol')
         recipient_email = request.data.get('recipient_email')
         recipient_username = request.data.get('recipient_username')
-        amount = Decimal(str(request.data.get('amount', 0)))
+        amount_str = str(request.data.get('amount', 0))
         note = request.data.get('note', '')
 
         # Validate required fields
@@ -413,6 +429,13 @@ def p2p_transfer(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        if not AMOUNT_RE.match(amount_str):
+            return Response(
+                {'error': 'Invalid amount'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        amount = Decimal(amount_str)
         if amount <= 0:
             return Response(
                 {'error': 'Amount must be greater than 0'},
@@ -421,7 +444,7 @@ def p2p_transfer(request):
 
         # Get currency
         try:
-            currency = Currency.objects.get(symbol=currency_symbol)
+            currency = get_currency(currency_symbol, active_only=False)
         except Currency.DoesNotExist:
             return Response(
                 {'error': f'Currency {currency_symbol} not found'},
@@ -432,7 +455,7 @@ def p2p_transfer(request):
         recipient = None
         if recipient_email:
             try:
-                recipient = User.objects.get(email=recipient_email)
+                recipient = User.objects.only('id', 'email', 'username').get(email=recipient_email)
             except User.DoesNotExist:
                 return Response(
                     {'error': 'Recipient not found with this email'},
@@ -440,7 +463,7 @@ def p2p_transfer(request):
                 )
         elif recipient_username:
             try:
-                recipient = User.objects.get(username=recipient_username)
+                recipient = User.objects.only('id', 'email', 'username').get(username=recipient_username)
             except User.DoesNotExist:
                 return Response(
                     {'error': 'Recipient not found with this username'},
@@ -454,80 +477,37 @@ def p2p_transfer(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get or create sender's balance
-        sender_balance, _ = Balance.objects.get_or_create(
-            user=request.user,
-            currency=currency,
-            defaults={'available': Decimal('0'), 'locked': Decimal('0')}
-        )
-
-        # Check sender has sufficient balance
-        if sender_balance.available < amount:
+        # Cheap early rejection; the worker re-checks in the database
+        available, _ = get_cached_balance(request.user.id, currency.id)
+        if available < amount:
             return Response(
                 {'error': 'Insufficient balance'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get or create recipient's balance
-        recipient_balance, _ = Balance.objects.get_or_create(
-            user=recipient,
+        # Record the request, then run the balance updates on a worker
+        # instead of the request thread once the row is committed
+        transfer = P2PTransfer.objects.create(
+            sender=request.user,
+            recipient=recipient,
             currency=currency,
-            defaults={'available': Decimal('0'), 'locked': Decimal('0')}
+            amount=amount,
+            note=note,
+            status='pending'
         )
-
-        # Perform transfer atomically
-        with transaction.atomic():
-            # Deduct from sender
-            sender_balance.available -= amount
-            sender_balance.save()
-
-            # Add to recipient
-            recipient_balance.available += amount
-            recipient_balance.save()
-
-            # Create transfer record
-            transfer = P2PTransfer.objects.create(
-                sender=request.user,
-                recipient=recipient,
-                currency=currency,
-                amount=amount,
-                note=note,
-                status='completed'
-            )
-
-            # Create ledger entries for audit trail
-            LedgerEntry.objects.create(
-                user=request.user,
-                currency=currency,
-                entry_type='p2p_send',
-                amount=-amount,
-                balance_after=sender_balance.available,
-                reference_id=str(transfer.id),
-                description=f'P2P transfer to {recipient.email or recipient.username}'
-            )
-
-            LedgerEntry.objects.create(
-                user=recipient,
-                currency=currency,
-                entry_type='p2p_receive',
-                amount=amount,
-                balance_after=recipient_balance.available,
-                reference_id=str(transfer.id),
-                description=f'P2P transfer from {request.user.email or request.user.username}'
-            )
+        transaction.on_commit(lambda: execute_p2p_transfer.delay(transfer.id))
 
         return Response({
             'success': True,
-            'message': f'Successfully sent {amount} {currency_symbol} to {recipient.email or recipient.username}',
+            'message': f'Transfer of {amount} {currency_symbol} to {recipient.email or recipient.username} submitted',
             'transfer': {
                 'id': transfer.id,
                 'amount': str(amount),
                 'currency': currency_symbol,
                 'recipient': recipient.email or recipient.username,
-                'status': 'completed',
-                'created_at': transfer.created_at.isoformat()
+                'status': transfer.status
             }
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_202_ACCEPTED)
 
     except Exception as e:
         return Response(
@@ -543,43 +523,68 @@ def get_transfers(request):
     Get user's P2P transfer history (both sent and received).
     """
     try:
-        # Get transfers where user is sender or recipient
-        sent = P2PTransfer.objects.filter(sender=request.user).select_related('recipient', 'currency')
-        received = P2PTransfer.objects.filter(recipient=request.user).select_related('sender', 'currency')
+        # One query for both directions, newest first
+        # Recipients only see transfers that actually moved funds
+        queryset = P2PTransfer.objects.filter(
+            Q(sender=request.user) | Q(recipient=request.user, status='completed')
+        ).select_related('sender', 'recipient', 'currency').order_by('-created_at')
 
-        transfers = []
+        paginator = PageNumberPagination()
+        page = paginator.paginate_queryset(queryset, request)
 
-        for t in sent:
-            transfers.append({
-                'id': t.id,
-                'type': 'sent',
-                'currency_symbol': t.currency.symbol,
-                'amount': str(t.amount),
-                'recipient': t.recipient.email or t.recipient.username,
-                'note': t.note,
-                'status': t.status,
-                'created_at': t.created_at.isoformat()
-            })
+        transfers = []
 
-        for t in received:
-            transfers.append({
+        for t in page:
+            data = {
                 'id': t.id,
-                'type': 'received',
                 'currency_symbol': t.currency.symbol,
                 'amount': str(t.amount),
-                'sender': t.sender.email or t.sender.username,
                 'note': t.note,
                 'status': t.status,
                 'created_at': t.created_at.isoformat()
-            })
-
-        # Sort by date descending
-        transfers.sort(key=lambda x: x['created_at'], reverse=True)
+            }
+            if t.sender_id == request.user.id:
+                data['type'] = 'sent'
+                data['recipient'] = t.recipient.email or t.recipient.username
+            else:
+                data['type'] = 'received'
+                data['sender'] = t.sender.email or t.sender.username
+            transfers.append(data)
 
-        return Response(transfers, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(transfers)
 
     except Exception as e:
         return Response(
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_transfer_status(request, transfer_id):
+    """
+    Get the outcome of a P2P transfer submitted by the user.
+    p2p_transfer returns 202 while the worker is still moving the funds;
+    poll this until status is 'completed' or 'failed'.
+    """
+    try:
+        transfer = P2PTransfer.objects.select_related('recipient', 'currency').get(
+            id=transfer_id, sender=request.user
+        )
+    except P2PTransfer.DoesNotExist:
+        return Response(
+            {'error': 'Transfer not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    return Response({
+        'id': transfer.id,
+        'currency_symbol': transfer.currency.symbol,
+        'amount': str(transfer.amount),
+        'recipient': transfer.recipient.email or transfer.recipient.username,
+        'status': transfer.status,
+        'error': transfer.failure_reason or None,
+        'created_at': transfer.created_at.isoformat(),
+        'updated_at': transfer.updated_at.isoformat()
+    })
@@ -5,15 +5,26 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db import transaction
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
-from decimal import Decimal, InvalidOperation
+from django.db.models.functions import Lower
+from decimal import Decimal
+import hashlib
+import re
 import uuid
 
-from .models import Balance, Currency
+from .models import Currency
+from .services.ledger import LedgerService
+from .services.currency_cache import get_currency
 
 User = get_user_model()
 
+# Plain non-negative decimal with at most 18 places (Balance precision)
+AMOUNT_RE = re.compile(r'^\d{1,18}(\.\d{1,18})?$')
+
+USER_SEARCH_CACHE_TIMEOUT = 60  # seconds
+USER_SEARCH_LIMIT = 10
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -34,58 +45,39 @@ def transfer_crypto(request):
     if not currency_symbol:
         return Response({'error': 'Currency is required'}, status=400)
     
-    try:
-        amount = Decimal(str(amount_str))
-        if amount <= 0:
-            return Response({'error': 'Amount must be positive'}, status=400)
-    except (InvalidOperation, ValueError):
+    if not AMOUNT_RE.match(str(amount_str)):
         return Response({'error': 'Invalid amount'}, status=400)
+    amount = Decimal(str(amount_str))
+    if amount <= 0:
+        return Response({'error': 'Amount must be positive'}, status=400)
 
     # Cannot send to yourself
     if recipient_email == sender.email.lower():
         return Response({'error': 'Cannot transfer to yourself'}, status=400)
 
-    # Find recipient
+    # Find recipient (recipient_email is already lowercased, matches user_email_lower_idx)
     try:
-        recipient = User.objects.get(email__iexact=recipient_email)
+        recipient = User.objects.only('id', 'email', 'username').annotate(
+            email_lower=Lower('email')
+        ).get(email_lower=recipient_email)
     except User.DoesNotExist:
         return Response({'error': 'Recipient not found on this platform'}, status=404)
 
     # Find currency
     try:
-        currency = Currency.objects.get(symbol=currency_symbol, is_active=True)
+        currency = get_currency(currency_symbol)
     except Currency.DoesNotExist:
         return Response({'error': f'Currency {currency_symbol} not found'}, status=404)
 
-    # Perform transfer atomically
-    with transaction.atomic():
-        # Get or create sender balance
-        sender_balance, _ = Balance.objects.get_or_create(
-            user=sender,
-            currency=currency,
-            defaults={'available': Decimal('0'), 'locked': Decimal('0')}
-        )
-
-        # Check sufficient balance
-        if sender_balance.available < amount:
-            return Response({
-                'error': f'Insufficient balance. You have {sender_balance.available} {currency_symbol}'
-            }, status=400)
-
-        # Get or create recipient balance
-        recipient_balance, _ = Balance.objects.get_or_create(
-            user=recipient,
-            currency=currency,
-            defaults={'available': Decimal('0'), 'locked': Decimal('0')}
-        )
-
-        # Deduct from sender
-        sender_balance.available -= amount
-        sender_balance.save()
-
-        # Add to recipient
-        recipient_balance.available += amount
-        recipient_balance.save()
+    def perform_transfer():
+        # Check-and-move in the database; raises ValueError if insufficient
+        LedgerService.transfer_available(sender, recipient, currency, amount)
+
+    # Perform transfer atomically, retrying on deadlock
+    try:
+        LedgerService.run_atomic_with_retry(perform_transfer)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
 
     return Response({
         'success': True,
@@ -126,19 +118,25 @@ def search_users(request):
     if len(query) < 3:
         return Response({'users': []})
     
-    users = User.objects.filter(
-        email__icontains=query,
-        is_active=True
-    ).exclude(
-        id=request.user.id
-    )[:10]
-    
+    # Results are shared between users, so cache one extra match and drop
+    # the requesting user afterwards
+    cache_key = 'usrsrch:' + hashlib.md5(query.lower().encode()).hexdigest()
+    emails = cache.get(cache_key)
+    if emails is None:
+        emails = list(User.objects.filter(
+            email__icontains=query,
+            is_active=True
+        ).values_list('email', flat=True)[:USER_SEARCH_LIMIT + 1])
+        cache.set(cache_key, emails, USER_SEARCH_CACHE_TIMEOUT)
+
+    emails = [email for email in emails if email != request.user.email][:USER_SEARCH_LIMIT]
+
     return Response({
         'users': [
             {
-                'email': u.email,
-                'display_name': u.email.split('@')[0],
+                'email': email,
+                'display_name': email.split('@')[0],
             }
-            for u in users
+            for email in emails
         ]
     })
@@ -4,6 +4,7 @@ Celery Configuration for CryptoExchange Demo
 
 import os
 from celery import Celery
+from celery.schedules import crontab
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 
@@ -45,3 +46,10 @@ app.conf.beat_schedule.update({
         'schedule': 3.0,  # Every 3 seconds
     },
 })
+
+app.conf.beat_schedule.update({
+    'purge-expired-email-tokens': {
+        'task': 'emails.tasks.purge_expired_tokens',
+        'schedule': crontab(hour=3, minute=30),  # Daily at 03:30
+    },
+})
@@ -87,8 +87,13 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -251,6 +256,13 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
 
+# SMTP delivery runs on its own queue so slow mail servers never hold up
+# other tasks: celery -A config worker -Q email_queue --concurrency=4
+CELERY_TASK_ROUTES = {
+    'emails.tasks.send_rendered_email': {'queue': 'email_queue'},
+    'emails.tasks.send_rendered_emails': {'queue': 'email_queue'},
+}
+
 # =============================================================================
 # INTERNATIONALIZATION
 # =============================================================================
@@ -285,6 +297,8 @@ EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "False").lower() == "true"
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "noreply@cryptoexchange.com")
+# Concurrent SMTP connections used for bulk sends; keep within the provider's limit
+EMAIL_SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", "8"))
 
 # =============================================================================
 # BLOCKCHAIN CONFIGURATION
@@ -319,6 +333,9 @@ EXCHANGE_CONFIG = {
     'DEFAULT_MAKER_FEE': 0.001,
     'DEFAULT_TAKER_FEE': 0.001,
     'WITHDRAWAL_AUTO_APPROVE_LIMIT': float(os.getenv('WITHDRAWAL_AUTO_APPROVE_LIMIT', '100')),
+    # Server-side prepared statements for hot ledger SQL (opt-in). Leave off when
+    # running behind a transaction-pooling proxy (e.g. PgBouncer) that does not keep sessions.
+    'LEDGER_PREPARED_STATEMENTS': os.getenv('LEDGER_PREPARED_STATEMENTS', 'False').lower() in ('true', '1', 'yes'),
 }
 
 # =============================================================================
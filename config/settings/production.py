@@ -61,6 +61,11 @@ if REDIS_URL:
         },
     }
 
+# API responses
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+    'apps.core.renderers.ORJSONRenderer',
+]
+
 # Security
 SECURE_SSL_REDIRECT = True
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
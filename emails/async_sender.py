@@ -0,0 +1,93 @@
+"""
+Async Email Sender
+==================
+Sends a burst of rendered emails over several concurrent SMTP
+connections with aiosmtplib, so the per-message round trips overlap
+instead of queueing behind one connection.
+"""
+
+import asyncio
+import logging
+
+import aiosmtplib
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Connection failures and SMTP errors; either way the message was not sent
+SEND_ERRORS = (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError)
+
+
+def _smtp_client():
+    return aiosmtplib.SMTP(
+        hostname=settings.EMAIL_HOST,
+        port=settings.EMAIL_PORT,
+        username=settings.EMAIL_HOST_USER or None,
+        password=settings.EMAIL_HOST_PASSWORD or None,
+        use_tls=getattr(settings, 'EMAIL_USE_SSL', False),
+        start_tls=settings.EMAIL_USE_TLS,
+        timeout=getattr(settings, 'EMAIL_TIMEOUT', None),
+    )
+
+
+async def _send_worker(queue, failed):
+    """Send messages from the queue over one SMTP connection until it is empty."""
+    smtp = _smtp_client()
+    try:
+        # Also logs in when credentials are configured
+        await smtp.connect()
+    except SEND_ERRORS as e:
+        # Leave the messages to the other connections
+        logger.warning(f"SMTP connection failed: {e}")
+        return
+
+    try:
+        while True:
+            try:
+                index, email = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            try:
+                await smtp.send_message(
+                    email.message(),
+                    sender=email.from_email,
+                    recipients=email.recipients(),
+                )
+            except SEND_ERRORS as e:
+                logger.warning(f"Failed to send email to {', '.join(email.to)}: {e}")
+                failed.append(index)
+    finally:
+        try:
+            await smtp.quit()
+        except SEND_ERRORS:
+            pass
+
+
+async def send_many(emails, concurrency=None):
+    """
+    Send EmailMessage objects over up to `concurrency` SMTP connections.
+
+    Messages must already be rendered, so the coroutines only do I/O.
+
+    Returns:
+        Indexes (into emails) of the messages that were not sent
+    """
+    concurrency = concurrency or settings.EMAIL_SEND_CONCURRENCY
+
+    queue = asyncio.Queue()
+    for item in enumerate(emails):
+        queue.put_nowait(item)
+
+    failed = []
+    await asyncio.gather(*(
+        _send_worker(queue, failed)
+        for _ in range(min(concurrency, len(emails)))
+    ))
+
+    # Anything still queued had no working connection
+    while not queue.empty():
+        index, _ = queue.get_nowait()
+        failed.append(index)
+
+    return sorted(failed)
@@ -4,11 +4,18 @@ Email Middleware
 Middleware for tracking logins and sending alerts
 """
 
+import hashlib
 import logging
+import re
+from functools import lru_cache
+from django.core.cache import cache
 from django.utils.deprecation import MiddlewareMixin
 
 logger = logging.getLogger(__name__)
 
+# A login from the same IP and user agent is alerted at most once per hour
+LOGIN_ALERT_DEDUP_TIMEOUT = 3600  # seconds
+
 
 def get_client_ip(request):
     """Extract client IP from request"""
@@ -20,31 +27,62 @@ def get_client_ip(request):
     return ip
 
 
+# User agent keywords as (keyword, category, name), highest priority first
+# within each category. Matches are ranked by this order rather than by
+# position: Edge and Chrome UAs also say "Safari", and Edge UAs also say
+# "Chrome" (Chromium Edge uses "Edg/"). Add new families here.
+USER_AGENT_KEYWORDS = (
+    ('Mobile', 'device', 'Mobile'),
+    ('Tablet', 'device', 'Tablet'),
+    ('Edg/', 'browser', 'Edge'),
+    ('Edge/', 'browser', 'Edge'),
+    ('Chrome', 'browser', 'Chrome'),
+    ('Firefox', 'browser', 'Firefox'),
+    ('Safari', 'browser', 'Safari'),
+)
+
+_USER_AGENT_DEFAULTS = {'device': 'Desktop', 'browser': 'Unknown'}
+
+# All keywords in one alternation, so the UA is scanned once however many
+# keywords there are
+_KEYWORD_RE = re.compile('|'.join(re.escape(keyword) for keyword, _, _ in USER_AGENT_KEYWORDS))
+_KEYWORD_RANK = {
+    keyword: (rank, category, name)
+    for rank, (keyword, category, name) in enumerate(USER_AGENT_KEYWORDS)
+}
+
+
+@lru_cache(maxsize=4096)
+def _parse_user_agent(user_agent):
+    """Device type and browser for a user agent string (cached per string)"""
+    found = dict(_USER_AGENT_DEFAULTS)
+    best = {}
+    for keyword in _KEYWORD_RE.findall(user_agent):
+        rank, category, name = _KEYWORD_RANK[keyword]
+        if rank < best.get(category, len(USER_AGENT_KEYWORDS)):
+            best[category] = rank
+            found[category] = name
+    
+    return f"{found['device']} - {found['browser']}"
+
+
 def get_device_info(request):
     """Extract device info from user agent"""
-    user_agent = request.META.get('HTTP_USER_AGENT', 'Unknown')
-    
-    # Simple device detection
-    if 'Mobile' in user_agent:
-        device_type = 'Mobile'
-    elif 'Tablet' in user_agent:
-        device_type = 'Tablet'
-    else:
-        device_type = 'Desktop'
-    
-    # Simple browser detection
-    if 'Chrome' in user_agent:
-        browser = 'Chrome'
-    elif 'Firefox' in user_agent:
-        browser = 'Firefox'
-    elif 'Safari' in user_agent:
-        browser = 'Safari'
-    elif 'Edge' in user_agent:
-        browser = 'Edge'
-    else:
-        browser = 'Unknown'
-    
-    return f"{device_type} - {browser}"
+    return _parse_user_agent(request.META.get('HTTP_USER_AGENT', 'Unknown'))
+
+
+def should_send_login_alert(user, request):
+    """
+    Claim the login alert for this user, IP and user agent.
+
+    Returns False if one was already sent within LOGIN_ALERT_DEDUP_TIMEOUT,
+    so callers can skip IP/user agent parsing and the email entirely.
+    """
+    fingerprint = hashlib.md5(
+        f"{request.META.get('HTTP_X_FORWARDED_FOR') or request.META.get('REMOTE_ADDR')}|"
+        f"{request.META.get('HTTP_USER_AGENT', '')}".encode()
+    ).hexdigest()
+    return cache.add(f'login_alert:{user.pk}:{fingerprint}', True, LOGIN_ALERT_DEDUP_TIMEOUT)
 
 
 def send_login_alert(user, request):
@@ -52,14 +90,6 @@ def send_login_alert(user, request):
     Send login alert email to user
     Call this from your login view after successful authentication
     """
-    from emails.signals import login_detected
-    
-    ip_address = get_client_ip(request)
-    device_info = get_device_info(request)
+    from emails.notifications import notify_login
     
-    login_detected.send(
-        sender=user.__class__,
-        user=user,
-        ip_address=ip_address,
-        device_info=device_info
-    )
+    notify_login(user, request)
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailverificationtoken',
+            index=models.Index(
+                condition=models.Q(('verified_at__isnull', True)),
+                fields=['user'],
+                name='emails_token_pending_user_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-15 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0002_emailverificationtoken_pending_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailverificationtoken',
+            index=models.Index(fields=['user', '-created_at'], name='emails_emai_user_id_739741_idx'),
+        ),
+    ]
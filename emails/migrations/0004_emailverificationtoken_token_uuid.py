@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-15 14:05
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0003_emailverificationtoken_user_created_index'),
+    ]
+
+    operations = [
+        # Existing tokens are uuid4().hex strings, which PostgreSQL casts
+        # to uuid in place (ALTER COLUMN ... TYPE uuid USING token::uuid)
+        migrations.AlterField(
+            model_name='emailverificationtoken',
+            name='token',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
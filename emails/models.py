@@ -6,7 +6,8 @@ Models for email verification tokens
 
 import uuid
 from datetime import timedelta
-from django.db import models
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
 
@@ -22,22 +23,43 @@ class EmailVerificationToken(models.Model):
         related_name='email_verification_tokens'
     )
     email = models.EmailField()
-    token = models.CharField(max_length=64, unique=True)
+    # Native uuid column: 16 bytes per row and in the unique index
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField()
     verified_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            # Pending tokens only - serves "invalidate old tokens" on resend
+            models.Index(
+                fields=['user'],
+                condition=models.Q(verified_at__isnull=True),
+                name='emails_token_pending_user_idx'
+            ),
+        ]
     
     def save(self, *args, **kwargs):
         if not self.expires_at:
             # Token expires in 24 hours
             self.expires_at = timezone.now() + timedelta(hours=24)
-        if not self.token:
-            self.token = uuid.uuid4().hex
         super().save(*args, **kwargs)
     
+    @classmethod
+    def bulk_issue(cls, users):
+        """
+        Issue one token per user with a single multi-row INSERT.
+        Expiry is filled in here, since bulk_create skips save().
+        """
+        expires_at = timezone.now() + timedelta(hours=24)
+        tokens = [
+            cls(user=user, email=user.email, expires_at=expires_at)
+            for user in users
+        ]
+        return cls.objects.bulk_create(tokens, batch_size=500)
+    
     @property
     def is_expired(self):
         return timezone.now() > self.expires_at
@@ -54,11 +76,12 @@ class EmailVerificationToken(models.Model):
             return False
         
         self.verified_at = timezone.now()
-        self.save()
         
-        # Update user's email_verified status
-        self.user.email_verified = True
-        self.user.save(update_fields=['email_verified'])
+        with transaction.atomic():
+            self.save(update_fields=['verified_at'])
+            
+            # Update user's verified status without loading the user
+            get_user_model().objects.filter(pk=self.user_id).update(is_email_verified=True)
         
         return True
     
@@ -4,27 +4,51 @@ Email Notifications Helper
 Easy-to-use functions for sending email notifications from anywhere in the app
 """
 
-from emails.signals import (
-    order_filled,
-    withdrawal_requested,
-    withdrawal_confirmed,
-    deposit_confirmed,
-    login_detected,
-)
+from django.db import transaction
+
+from emails.middleware import get_client_ip, get_device_info, should_send_login_alert
+from emails.services import EmailService
+from emails.tasks import ORDER_DIGEST_WINDOW, record_order_filled, send_order_filled_digest
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def send_after_commit(label, method_name, email, *args):
+    """
+    Call EmailService.<method_name>(*args) once the current transaction
+    commits, so emails never go out for rolled-back changes and rendering
+    never runs while the transaction holds row locks.
+    """
+    def send():
+        try:
+            getattr(EmailService, method_name)(*args)
+            logger.info(f"{label} email sent to {email}")
+        except Exception as e:
+            logger.error(f"Failed to send {label.lower()} email to {email}: {e}")
+
+    transaction.on_commit(send)
+
+
 def notify_order_filled(user, order):
     """
-    Call this when an order is filled
+    Call this when an order is filled.
+    Fills within ORDER_DIGEST_WINDOW of each other are sent as one email.
     
     Usage:
         from emails.notifications import notify_order_filled
         notify_order_filled(user, order)
     """
-    order_filled.send(sender=order.__class__, user=user, order=order)
+    def schedule_digest():
+        # The first fill in a window schedules the digest; later fills in
+        # the same window are recorded for it
+        if record_order_filled(user.pk, str(order.pk)):
+            send_order_filled_digest.apply_async(
+                args=[str(user.pk), str(order.pk)],
+                countdown=ORDER_DIGEST_WINDOW
+            )
+
+    transaction.on_commit(schedule_digest)
 
 
 def notify_withdrawal_requested(user, withdrawal):
@@ -35,7 +59,7 @@ def notify_withdrawal_requested(user, withdrawal):
         from emails.notifications import notify_withdrawal_requested
         notify_withdrawal_requested(user, withdrawal)
     """
-    withdrawal_requested.send(sender=withdrawal.__class__, user=user, withdrawal=withdrawal)
+    send_after_commit('Withdrawal requested', 'send_withdrawal_requested', user.email, user, withdrawal)
 
 
 def notify_withdrawal_confirmed(user, withdrawal):
@@ -46,7 +70,7 @@ def notify_withdrawal_confirmed(user, withdrawal):
         from emails.notifications import notify_withdrawal_confirmed
         notify_withdrawal_confirmed(user, withdrawal)
     """
-    withdrawal_confirmed.send(sender=withdrawal.__class__, user=user, withdrawal=withdrawal)
+    send_after_commit('Withdrawal confirmed', 'send_withdrawal_confirmed', user.email, user, withdrawal)
 
 
 def notify_deposit_confirmed(user, deposit):
@@ -57,7 +81,7 @@ def notify_deposit_confirmed(user, deposit):
         from emails.notifications import notify_deposit_confirmed
         notify_deposit_confirmed(user, deposit)
     """
-    deposit_confirmed.send(sender=deposit.__class__, user=user, deposit=deposit)
+    send_after_commit('Deposit confirmed', 'send_deposit_confirmed', user.email, user, deposit)
 
 
 def notify_login(user, request):
@@ -68,17 +92,13 @@ def notify_login(user, request):
         from emails.notifications import notify_login
         notify_login(user, request)
     """
-    from emails.middleware import get_client_ip, get_device_info
+    if not should_send_login_alert(user, request):
+        return
     
     ip_address = get_client_ip(request)
     device_info = get_device_info(request)
     
-    login_detected.send(
-        sender=user.__class__,
-        user=user,
-        ip_address=ip_address,
-        device_info=device_info
-    )
+    send_after_commit('Login alert', 'send_login_alert', user.email, user, ip_address, device_info)
 
 
 def notify_2fa_enabled(user):
@@ -89,7 +109,6 @@ def notify_2fa_enabled(user):
         from emails.notifications import notify_2fa_enabled
         notify_2fa_enabled(user)
     """
-    from emails.services import EmailService
     EmailService.send_2fa_enabled(user)
 
 
@@ -101,7 +120,6 @@ def notify_2fa_disabled(user):
         from emails.notifications import notify_2fa_disabled
         notify_2fa_disabled(user)
     """
-    from emails.services import EmailService
     EmailService.send_2fa_disabled(user)
 
 
@@ -113,7 +131,6 @@ def notify_password_changed(user):
         from emails.notifications import notify_password_changed
         notify_password_changed(user)
     """
-    from emails.services import EmailService
     EmailService.send_password_changed(user)
 
 
@@ -125,5 +142,4 @@ def notify_api_key_created(user, key_name):
         from emails.notifications import notify_api_key_created
         notify_api_key_created(user, "My Trading Bot")
     """
-    from emails.services import EmailService
     EmailService.send_api_key_created(user, key_name)
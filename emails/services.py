@@ -4,15 +4,89 @@ Email Service
 Centralized email sending service with templates
 """
 
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+import time
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.db import transaction
+from django.template import TemplateDoesNotExist, engines
+from django.template.loader import get_template
 from django.conf import settings
 from django.utils import timezone
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
 import logging
 
+from emails.tasks import send_rendered_email, send_rendered_emails
+
 logger = logging.getLogger(__name__)
 
 
+# Context shared by every email
+SITE_CONTEXT = {
+    'site_name': 'CryptoExchange',
+    'site_url': getattr(settings, 'FRONTEND_URL', 'https://cryptoexchange.com'),
+    'support_email': 'support@cryptoexchange.com',
+}
+
+
+@lru_cache(maxsize=1)
+def _year_for_day(day):
+    return timezone.now().year
+
+
+def _current_year():
+    """Current year, recomputed at most once per (UTC) day"""
+    return _year_for_day(int(time.time() // 86400))
+
+
+@lru_cache(maxsize=64)
+def _get_template(name, optional=False):
+    """Loaded template for name, or None if it does not exist (cached either way)."""
+    try:
+        return get_template(name)
+    except TemplateDoesNotExist:
+        # Cached, so this is logged once per template and process
+        if not optional:
+            logger.warning(f"Email template {name} not found")
+        return None
+
+
+# Bump whenever emails/base.html changes, so stale skeletons are not reused
+EMAIL_SKELETON_VERSION = 1
+
+_CONTENT_MARKER = '<!--email-content-->'
+_SUBJECT_MARKER = '<!--email-subject-->'
+
+
+def _email_skeleton():
+    """
+    emails/base.html rendered with the site context, as (top, bottom)
+    around its content block.
+
+    Cached without expiry; the key changes with EMAIL_SKELETON_VERSION and
+    the year. The subject is left as a marker, since it differs per email.
+    """
+    year = _current_year()
+    key = f'email_skeleton:v{EMAIL_SKELETON_VERSION}:{year}'
+    skeleton = cache.get(key)
+
+    if skeleton is None:
+        template = engines['django'].from_string(
+            '{% extends "emails/base.html" %}'
+            '{% block content %}' + _CONTENT_MARKER + '{% endblock %}'
+        )
+        html = template.render({
+            **SITE_CONTEXT,
+            'current_year': year,
+            'subject': mark_safe(_SUBJECT_MARKER),
+        })
+        skeleton = tuple(html.split(_CONTENT_MARKER, 1))
+        cache.set(key, skeleton, None)
+
+    return skeleton
+
+
 class EmailService:
     """
     Service class for sending all email notifications
@@ -21,47 +95,106 @@ class EmailService:
     FROM_EMAIL = settings.DEFAULT_FROM_EMAIL
     
     @classmethod
-    def send_email(cls, to_email, subject, template_name, context=None):
+    def render_email(cls, subject, template_name, context=None):
         """
-        Send an email using a template
+        Render an email template.
+
+        Templates under emails/content/ hold only the body and are wrapped
+        in the cached emails/base.html skeleton; anything else is rendered
+        from emails/<template_name>.html as a full page.
+
+        Returns:
+            Tuple of (text_content, html_content)
+
+        Raises:
+            TemplateDoesNotExist: If there is no HTML template
         """
-        if context is None:
-            context = {}
+        # Copy rather than update, so the caller's dict is left untouched
+        context = {**SITE_CONTEXT, 'current_year': _current_year(), **(context or {})}
         
-        context.update({
-            'site_name': 'CryptoExchange',
-            'site_url': getattr(settings, 'FRONTEND_URL', 'https://cryptoexchange.com'),
-            'support_email': 'support@cryptoexchange.com',
-            'current_year': timezone.now().year,
-        })
+        content_template = _get_template(f'emails/content/{template_name}.html', optional=True)
+        if content_template is not None:
+            # Layout comes from the cached skeleton; only the body is rendered
+            top, bottom = _email_skeleton()
+            html_content = (
+                top.replace(_SUBJECT_MARKER, escape(subject))
+                + content_template.render(context)
+                + bottom
+            )
+        else:
+            # Standalone template with its own layout
+            html_template = _get_template(f'emails/{template_name}.html')
+            if html_template is None:
+                raise TemplateDoesNotExist(f'emails/{template_name}.html')
+            html_content = html_template.render(context)
         
+        # Render text template if there is one
+        text_template = _get_template(f'emails/{template_name}.txt', optional=True)
+        if text_template is not None:
+            text_content = text_template.render(context)
+        else:
+            # If no .txt template, create plain text from subject
+            text_content = f"{subject}\n\nPlease view this email in an HTML-compatible email client."
+        
+        return text_content, html_content
+    
+    @classmethod
+    def send_email(cls, to_email, subject, template_name, context=None):
+        """
+        Render an email template and queue it for delivery.
+
+        Templates are rendered here, while the context objects are at hand;
+        only the rendered strings go to the Celery task, which sends them
+        after the current transaction commits.
+        """
         try:
-            # Render HTML template
-            html_content = render_to_string(f'emails/{template_name}.html', context)
+            text_content, html_content = cls.render_email(subject, template_name, context)
             
-            # Try to render text template, fallback to stripping HTML
-            try:
-                text_content = render_to_string(f'emails/{template_name}.txt', context)
-            except Exception:
-                # If no .txt template, create plain text from subject
-                text_content = f"{subject}\n\nPlease view this email in an HTML-compatible email client."
-            
-            email = EmailMultiAlternatives(
-                subject=subject,
-                body=text_content,
-                from_email=cls.FROM_EMAIL,
-                to=[to_email],
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
+            transaction.on_commit(lambda: send_rendered_email.delay(
+                to_email, subject, text_content, html_content, cls.FROM_EMAIL, template_name
+            ))
             
-            logger.info(f"Email sent: {template_name} to {to_email}")
+            logger.info(f"Email queued: {template_name} to {to_email}")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email {template_name} to {to_email}: {e}")
+            logger.error(f"Failed to queue email {template_name} to {to_email}: {e}")
             return False
     
+    @classmethod
+    def send_bulk(cls, emails):
+        """
+        Render several emails and queue them as one task that sends them
+        all over a single SMTP connection.
+
+        Args:
+            emails: Iterable of (to_email, subject, template_name, context) tuples
+
+        Returns:
+            Number of emails queued
+        """
+        messages = []
+        for to_email, subject, template_name, context in emails:
+            try:
+                text_content, html_content = cls.render_email(subject, template_name, context)
+            except Exception as e:
+                logger.error(f"Failed to render email {template_name} to {to_email}: {e}")
+                continue
+            messages.append({
+                'to_email': to_email,
+                'subject': subject,
+                'text_content': text_content,
+                'html_content': html_content,
+                'from_email': cls.FROM_EMAIL,
+                'template_name': template_name,
+            })
+
+        if messages:
+            transaction.on_commit(lambda: send_rendered_emails.delay(messages))
+            logger.info(f"Bulk email queued: {len(messages)} messages")
+
+        return len(messages)
+    
     @classmethod
     def send_welcome_email(cls, user):
         """Send welcome email to new user"""
@@ -73,7 +206,7 @@ class EmailService:
         )
     
     @classmethod
-    def send_login_alert(cls, user, ip_address, device_info):
+    def send_login_alert(cls, user, ip_address, device_info, location=None):
         """Send login alert email"""
         return cls.send_email(
             to_email=user.email,
@@ -83,6 +216,7 @@ class EmailService:
                 'user': user,
                 'ip_address': ip_address,
                 'device_info': device_info,
+                'location': location,
                 'login_time': timezone.now(),
             }
         )
@@ -92,11 +226,21 @@ class EmailService:
         """Send order filled notification"""
         return cls.send_email(
             to_email=user.email,
-            subject=f"Order Filled - {order.side.upper()} {order.symbol}",
+            subject=f"Order Filled - {order.side.upper()} {order.trading_pair.symbol}",
             template_name="order_filled",
             context={'user': user, 'order': order}
         )
     
+    @classmethod
+    def send_order_filled_digest(cls, user, orders):
+        """Send one notification covering several filled orders"""
+        return cls.send_email(
+            to_email=user.email,
+            subject=f"{len(orders)} Orders Filled - CryptoExchange",
+            template_name="order_filled_digest",
+            context={'user': user, 'orders': orders}
+        )
+    
     @classmethod
     def send_withdrawal_requested(cls, user, withdrawal):
         """Send withdrawal request confirmation"""
@@ -168,12 +312,40 @@ class EmailService:
         )
 
 
+    @classmethod
+    def issue_verification(cls, user):
+        """
+        Replace the user's pending verification token with a new one and
+        email its link.
+
+        Runs in one transaction, so the email is only queued (on commit)
+        once the new token is actually stored.
+
+        Returns:
+            True if the email was queued
+        """
+        from emails.models import EmailVerificationToken
+
+        with transaction.atomic():
+            # Invalidate old tokens (a single DELETE: nothing cascades from them)
+            EmailVerificationToken.objects.filter(
+                user=user,
+                verified_at__isnull=True
+            ).delete()
+            
+            token = EmailVerificationToken.objects.create(
+                user=user,
+                email=user.email
+            )
+            
+            return cls.send_verification_email(user, token)
+    
     @classmethod
     def send_verification_email(cls, user, token):
         """Send email verification link"""
         from django.conf import settings
         
-        verification_url = f"{getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')}/verify-email?token={token.token}"
+        verification_url = f"{getattr(settings, 'FRONTEND_URL', 'http://localhost:3000')}/verify-email?token={token.token.hex}"
         
         return cls.send_email(
             to_email=user.email,
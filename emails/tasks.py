@@ -0,0 +1,210 @@
+"""
+Email Celery Tasks
+==================
+SMTP delivery for emails rendered by EmailService.
+"""
+
+import asyncio
+import logging
+from smtplib import SMTPException
+
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: SMTP failures and network trouble reaching the server
+SMTP_RETRY_ERRORS = (SMTPException, ConnectionError, TimeoutError)
+
+SMTP_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+
+
+def _build_message(to_email, subject, text_content, html_content, from_email=None,
+                   template_name='', connection=None):
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=[to_email],
+        connection=connection,
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+
+@shared_task(
+    name='emails.tasks.send_rendered_email',
+    autoretry_for=SMTP_RETRY_ERRORS,
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_rendered_email(to_email: str, subject: str, text_content: str, html_content: str,
+                        from_email: str = None, template_name: str = ''):
+    """
+    Send an already rendered email.
+    Queued by EmailService.send_email once the caller's transaction commits;
+    SMTP errors are retried with exponential backoff.
+    """
+    _build_message(to_email, subject, text_content, html_content, from_email).send()
+
+    logger.info(f"Email sent: {template_name} to {to_email}")
+    return {'status': 'sent'}
+
+
+@shared_task(
+    bind=True,
+    name='emails.tasks.send_rendered_emails',
+    autoretry_for=SMTP_RETRY_ERRORS,
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_rendered_emails(self, messages: list):
+    """
+    Send several already rendered emails.
+    Each item holds send_rendered_email's keyword arguments.
+    Queued by EmailService.send_bulk.
+
+    With the SMTP backend the messages go out over EMAIL_SEND_CONCURRENCY
+    concurrent connections, and only the ones that failed are retried.
+    Other backends send them over a single connection.
+    """
+    if settings.EMAIL_BACKEND != SMTP_BACKEND:
+        with get_connection() as connection:
+            sent = connection.send_messages([
+                _build_message(connection=connection, **message) for message in messages
+            ])
+
+        logger.info(f"Bulk email sent: {sent} of {len(messages)} messages")
+        return {'status': 'sent', 'sent': sent}
+
+    from emails.async_sender import send_many
+
+    failed = asyncio.run(send_many([_build_message(**message) for message in messages]))
+    sent = len(messages) - len(failed)
+
+    logger.info(f"Bulk email sent: {sent} of {len(messages)} messages")
+    if failed:
+        raise self.retry(args=[[messages[index] for index in failed]])
+
+    return {'status': 'sent', 'sent': sent}
+
+
+@shared_task(name='emails.tasks.purge_expired_tokens')
+def purge_expired_tokens(days_to_keep: int = 7, chunk_size: int = 1000):
+    """
+    Delete verification tokens that expired more than days_to_keep days ago.
+    Deletes in chunks so no single statement holds locks for long.
+    Runs daily.
+    """
+    from datetime import timedelta
+    from django.utils import timezone
+    from emails.models import EmailVerificationToken
+
+    cutoff_date = timezone.now() - timedelta(days=days_to_keep)
+    expired = EmailVerificationToken.objects.filter(expires_at__lt=cutoff_date)
+
+    deleted_count = 0
+    while True:
+        ids = list(expired.order_by().values_list('id', flat=True)[:chunk_size])
+        if not ids:
+            break
+        deleted, _ = EmailVerificationToken.objects.filter(id__in=ids).delete()
+        deleted_count += deleted
+
+    logger.info(f"Deleted {deleted_count} expired verification tokens")
+
+    return {'status': 'completed', 'deleted': deleted_count}
+
+
+ORDER_DIGEST_WINDOW = 30  # seconds
+
+# Lifetime of the recorded order ids. The window key gets a few windows
+# so a queued digest still owns it; the digest task deletes it on start.
+ORDER_DIGEST_KEY_TIMEOUT = 24 * 60 * 60  # seconds
+ORDER_DIGEST_LOCK_TIMEOUT = 10 * ORDER_DIGEST_WINDOW  # seconds
+
+
+def order_digest_key(user_id, suffix=None) -> str:
+    """Cache key for a user's order digest: the window lock, or one of its parts"""
+    key = f'order-digest:{user_id}'
+    return f'{key}:{suffix}' if suffix is not None else key
+
+
+def record_order_filled(user_id, order_id) -> bool:
+    """
+    Record a filled order for the user's next digest.
+
+    The id goes into a numbered slot before the window is claimed, so a
+    digest that has already started still finds it. Returns True if this
+    call opened a new window and the caller must schedule the digest.
+    """
+    if cache.add(order_digest_key(user_id, 'seq'), 0, ORDER_DIGEST_KEY_TIMEOUT):
+        # New sequence: slots from an expired one must not be skipped
+        cache.delete(order_digest_key(user_id, 'flushed'))
+    try:
+        slot = cache.incr(order_digest_key(user_id, 'seq'))
+    except ValueError:
+        # Cache without shared state; the digest gets the id as an argument
+        slot = None
+    if slot is not None:
+        cache.set(order_digest_key(user_id, slot), order_id, ORDER_DIGEST_KEY_TIMEOUT)
+
+    return cache.add(order_digest_key(user_id), True, ORDER_DIGEST_LOCK_TIMEOUT)
+
+
+def _pop_recorded_orders(user_id) -> set:
+    """Take the order ids recorded since the previous digest"""
+    # Release the window first, so later fills schedule the next digest
+    cache.delete(order_digest_key(user_id))
+
+    last = cache.get(order_digest_key(user_id, 'seq'))
+    if not last:
+        return set()
+    first = cache.get(order_digest_key(user_id, 'flushed'), 0) + 1
+    cache.set(order_digest_key(user_id, 'flushed'), last, ORDER_DIGEST_KEY_TIMEOUT)
+
+    slot_keys = [order_digest_key(user_id, slot) for slot in range(first, last + 1)]
+    recorded = cache.get_many(slot_keys)
+    cache.delete_many(slot_keys)
+    return set(recorded.values())
+
+
+@shared_task(name='emails.tasks.send_order_filled_digest')
+def send_order_filled_digest(user_id: str, order_id: str):
+    """
+    Send one email for every order recorded by record_order_filled since
+    the previous digest. Scheduled by notify_order_filled at the start of
+    a digest window; order_id is the fill that opened it.
+    """
+    from django.contrib.auth import get_user_model
+    from apps.trading.models import Order
+    # Imported here: emails.services imports this module
+    from emails.services import EmailService
+
+    user = get_user_model().objects.filter(id=user_id).first()
+    if user is None:
+        return {'status': 'not_found'}
+
+    # Claim each order, so one recorded by two overlapping windows is
+    # only ever sent once
+    order_ids = [
+        pk for pk in _pop_recorded_orders(user_id) | {order_id}
+        if cache.add(f'order-filled-sent:{pk}', True, ORDER_DIGEST_KEY_TIMEOUT)
+    ]
+
+    orders = list(Order.objects.filter(
+        pk__in=order_ids,
+        user_id=user_id,
+        status=Order.Status.FILLED
+    ).select_related('trading_pair').order_by('updated_at'))
+
+    if not orders:
+        return {'status': 'empty'}
+    if len(orders) == 1:
+        EmailService.send_order_filled(user, orders[0])
+    else:
+        EmailService.send_order_filled_digest(user, orders)
+
+    return {'status': 'completed', 'orders': len(orders)}
@@ -1,3 +1,96 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
 
-# Create your tests here.
+from emails.tasks import _pop_recorded_orders, record_order_filled
+from emails.validators import EmailValidator
+
+
+class EmailFormatTests(SimpleTestCase):
+
+    def test_plain_address(self):
+        self.assertEqual(EmailValidator.validate_format('someone@example.com'), (True, None))
+
+    def test_ip_literal_address(self):
+        self.assertEqual(EmailValidator.validate_format('someone@[192.0.2.1]'), (True, None))
+
+    def test_forbidden_characters_are_rejected(self):
+        for email in ('some one@example.com', 'a,b@example.com', '<someone@example.com>', 'some\\one@example.com'):
+            self.assertFalse(EmailValidator.validate_format(email)[0], email)
+
+
+class DisposableDomainTests(SimpleTestCase):
+
+    def test_listed_domain(self):
+        self.assertTrue(EmailValidator.is_disposable('someone@mailinator.com'))
+
+    def test_subdomain_of_listed_domain(self):
+        self.assertTrue(EmailValidator.is_disposable('someone@foo.mailinator.com'))
+        self.assertTrue(EmailValidator.is_disposable('someone@a.b.Mailinator.com'))
+
+    def test_lookalike_domain_is_not_disposable(self):
+        self.assertFalse(EmailValidator.is_disposable('someone@notmailinator.com'))
+        self.assertFalse(EmailValidator.is_disposable('someone@mailinator.com.example.org'))
+        self.assertFalse(EmailValidator.is_disposable('someone@gmail.com'))
+
+    def test_validate_full_rejects_disposable_subdomain(self):
+        result = EmailValidator.validate_full('someone@foo.mailinator.com')
+
+        self.assertFalse(result['is_valid'])
+        self.assertEqual(result['error'], "Disposable email addresses are not allowed")
+
+
+class DomainTypoTests(SimpleTestCase):
+
+    def assertSuggests(self, email, suggestion):
+        self.assertEqual(EmailValidator.check_domain_typo(email), (True, suggestion))
+
+    def assertNoSuggestion(self, email):
+        self.assertEqual(EmailValidator.check_domain_typo(email), (False, None))
+
+    def test_listed_typo(self):
+        self.assertSuggests('someone@gmial.com', 'someone@gmail.com')
+
+    def test_near_miss_of_provider(self):
+        self.assertSuggests('someone@gmial.cm', 'someone@gmail.com')
+        self.assertSuggests('someone@htomail.com', 'someone@hotmail.com')
+        self.assertSuggests('someone@yahoo.con', 'someone@yahoo.com')
+
+    def test_known_domains_are_not_corrected(self):
+        self.assertNoSuggestion('someone@gmail.com')
+        self.assertNoSuggestion('someone@mail.com')
+        self.assertNoSuggestion('someone@email.com')
+        self.assertNoSuggestion('someone@cloud.com')
+
+    def test_regional_provider_domains_are_not_corrected(self):
+        self.assertNoSuggestion('someone@yahoo.ca')
+        self.assertNoSuggestion('someone@protonmail.ch')
+
+    def test_unrelated_and_oversized_domains(self):
+        self.assertNoSuggestion('someone@company.org')
+        self.assertNoSuggestion('someone@' + 'a' * 240 + '.com')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class OrderDigestTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_first_fill_opens_the_window(self):
+        self.assertTrue(record_order_filled('u1', 'o1'))
+        self.assertFalse(record_order_filled('u1', 'o2'))
+        self.assertTrue(record_order_filled('u2', 'o3'))
+
+    def test_digest_takes_each_recorded_order_once(self):
+        record_order_filled('u1', 'o1')
+        record_order_filled('u1', 'o2')
+
+        self.assertEqual(_pop_recorded_orders('u1'), {'o1', 'o2'})
+        self.assertEqual(_pop_recorded_orders('u1'), set())
+
+    def test_fill_after_digest_starts_opens_a_new_window(self):
+        record_order_filled('u1', 'o1')
+        _pop_recorded_orders('u1')
+
+        self.assertTrue(record_order_filled('u1', 'o2'))
+        self.assertEqual(_pop_recorded_orders('u1'), {'o2'})
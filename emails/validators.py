@@ -7,11 +7,201 @@ Validates email format, domain, and handles email verification
 import re
 import dns.resolver
 import logging
+from functools import lru_cache
+from importlib import resources
+from types import MappingProxyType
+from django.core.cache import cache
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 
+# The format checks run on unauthenticated input, so use RE2 (linear-time,
+# no backtracking) when google-re2 is installed. The patterns below stick
+# to syntax both engines share.
+try:
+    import re2 as email_regex
+except ImportError:
+    email_regex = re
+
 logger = logging.getLogger(__name__)
 
+# Domain (MX/A) check results are shared between all lookups of a domain,
+# for the DNS record's TTL but no longer than this
+DOMAIN_CHECK_CACHE_TIMEOUT = 3600  # seconds
+# Domains that cannot receive mail are rechecked sooner
+NEGATIVE_DOMAIN_CHECK_CACHE_TIMEOUT = 60  # seconds
+
+# Longest one DNS query (MX, or the A fallback) may block the request;
+# half of it per nameserver attempt, so each query gets one retry
+DNS_LOOKUP_TIMEOUT = 2  # seconds
+
+# Large providers that are known to receive mail; never looked up
+KNOWN_MAIL_DOMAINS = frozenset({
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'ymail.com',
+    'outlook.com', 'hotmail.com', 'live.com', 'msn.com',
+    'icloud.com', 'me.com', 'mac.com', 'aol.com',
+    'proton.me', 'protonmail.com', 'gmx.com', 'gmx.net',
+    'mail.com', 'zoho.com', 'yandex.com', 'yandex.ru',
+    'fastmail.com', 'hey.com', 'qq.com', '163.com',
+})
+
+# Reserved for documentation and testing (RFC 2606, RFC 6761); they can
+# never receive mail, so they are rejected without a lookup
+KNOWN_BAD_DOMAINS = frozenset({'example.com', 'example.net', 'example.org'})
+RESERVED_TLDS = frozenset({'example', 'invalid', 'local', 'localhost', 'test'})
+
+# Providers check_domain_typo suggests for near-miss domains. Only names
+# long enough that a couple of edits rarely land on another real domain.
+TYPO_TARGET_DOMAINS = (
+    'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com',
+    'icloud.com', 'googlemail.com', 'protonmail.com',
+)
+MAX_TYPO_DISTANCE = 2
+
+# Real domains within MAX_TYPO_DISTANCE of a target; never "corrected"
+NOT_TYPO_DOMAINS = frozenset({'email.com', 'cloud.com'})
+
+# Two-letter endings that are typos of .com rather than a country's
+# regional site (yahoo.ca, protonmail.ch are real)
+TYPO_COUNTRY_CODES = frozenset({'co', 'cm', 'om'})
+
+# Longest address an EmailField (max_length=254) can store
+MAX_EMAIL_LENGTH = 254
+
+# Longest local part (before the '@') allowed by RFC 5321
+MAX_LOCAL_PART_LENGTH = 64
+
+# Characters that never appear in an address we accept. Brackets are
+# allowed: validate_email accepts IP-literal domains (user@[192.0.2.1])
+FORBIDDEN_EMAIL_CHARS_RE = email_regex.compile(r'[\s,;<>()\\]')
+
+# Plain ASCII addresses, compiled once; use with fullmatch(). Everything
+# it matches is also accepted by Django's validate_email, which still
+# handles the rest (quoted local parts, IDN domains, IP literals).
+EMAIL_RE = email_regex.compile(
+    r"(?i)[A-Z0-9_%+-]+(?:\.[A-Z0-9_%+-]+)*"
+    r"@(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,63}"
+)
+
+
+def _load_domain_list(name):
+    """Domains listed in emails/data/<name>, skipping blanks and # comments"""
+    text = resources.files('emails').joinpath('data', name).read_text()
+    return frozenset(
+        line.strip().lower()
+        for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith('#')
+    )
+
+
+def _build_domain_classifier(disposable_domains, typo_domains):
+    """
+    Pattern for fullmatch() on a lowercased domain; lastgroup names its
+    class: 'disposable' (a listed domain or any subdomain of one) or 'typo'
+    """
+    # (?!) never matches, in case a list is empty
+    disposable = '|'.join(re.escape(d) for d in sorted(disposable_domains)) or '(?!)'
+    typos = '|'.join(re.escape(d) for d in sorted(typo_domains)) or '(?!)'
+    return re.compile(rf'(?:.*\.)?(?P<disposable>{disposable})|(?P<typo>{typos})')
+
+
+@lru_cache(maxsize=1)
+def _get_resolver():
+    """Resolver shared by all lookups, built on first use"""
+    resolver = dns.resolver.Resolver()
+    resolver.timeout = DNS_LOOKUP_TIMEOUT / 2
+    resolver.lifetime = DNS_LOOKUP_TIMEOUT
+    return resolver
+
+
+def _deletes(word, distance):
+    """Every string made by deleting up to `distance` characters from word"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+
+def _build_typo_index():
+    """Symmetric-delete index: deletion variant -> target domains"""
+    index = {}
+    for domain in TYPO_TARGET_DOMAINS:
+        for variant in _deletes(domain, MAX_TYPO_DISTANCE):
+            index.setdefault(variant, []).append(domain)
+    return index
+
+
+TYPO_INDEX = _build_typo_index()
+
+
+def _edit_distance(a, b):
+    """Levenshtein distance, counting a swap of adjacent characters as one edit"""
+    before_previous, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+# Domains outside this length range are too far from every target
+MIN_TYPO_DOMAIN_LENGTH = min(map(len, TYPO_TARGET_DOMAINS)) - MAX_TYPO_DISTANCE
+MAX_TYPO_DOMAIN_LENGTH = max(map(len, TYPO_TARGET_DOMAINS)) + MAX_TYPO_DISTANCE
+
+
+def _is_regional_variant(domain, target):
+    """Whether domain is target's provider under a country code, e.g. yahoo.ca"""
+    name, _, tld = domain.rpartition('.')
+    return (
+        name == target.rpartition('.')[0]
+        and len(tld) == 2
+        and tld not in TYPO_COUNTRY_CODES
+    )
+
+
+@lru_cache(maxsize=1024)
+def _closest_provider(domain):
+    """
+    The single closest TYPO_TARGET_DOMAINS entry within MAX_TYPO_DISTANCE
+    edits of domain, or None (also when two targets are equally close)
+    """
+    # Checked before generating deletes: their count grows with the square
+    # of the domain's length, and the domain is client input
+    if not MIN_TYPO_DOMAIN_LENGTH <= len(domain) <= MAX_TYPO_DOMAIN_LENGTH:
+        return None
+    if domain in NOT_TYPO_DOMAINS:
+        return None
+
+    # Targets sharing a deletion variant with domain are the only ones
+    # that can be within range; confirm with the real distance
+    candidates = {
+        target
+        for variant in _deletes(domain, MAX_TYPO_DISTANCE)
+        for target in TYPO_INDEX.get(variant, ())
+    }
+
+    best, best_distance, tied = None, MAX_TYPO_DISTANCE + 1, False
+    for target in candidates:
+        distance = _edit_distance(domain, target)
+        if distance == 0 or distance > MAX_TYPO_DISTANCE:
+            continue
+        if distance < best_distance:
+            best, best_distance, tied = target, distance, False
+        elif distance == best_distance:
+            tied = True
+
+    if best is None or tied or _is_regional_variant(domain, best):
+        return None
+    return best
+
 
 class EmailValidator:
     """
@@ -19,15 +209,10 @@ class EmailValidator:
     """
     
     # Common disposable email domains to block
-    DISPOSABLE_DOMAINS = {
-        'tempmail.com', 'throwaway.email', 'guerrillamail.com',
-        'mailinator.com', '10minutemail.com', 'fakeinbox.com',
-        'temp-mail.org', 'disposablemail.com', 'yopmail.com',
-        'trashmail.com', 'getnada.com', 'maildrop.cc',
-    }
+    DISPOSABLE_DOMAINS = _load_domain_list('disposable_domains.txt')
     
-    # Common typos in popular domains
-    DOMAIN_TYPOS = {
+    # Common typos in popular domains (read-only)
+    DOMAIN_TYPOS = MappingProxyType({
         'gmial.com': 'gmail.com',
         'gmal.com': 'gmail.com',
         'gamil.com': 'gmail.com',
@@ -38,7 +223,11 @@ class EmailValidator:
         'hotmal.com': 'hotmail.com',
         'hotmai.com': 'hotmail.com',
         'outlok.com': 'outlook.com',
-    }
+    })
+    
+    # Both tables as one precompiled pattern, so validate_full classifies a
+    # domain in a single pass
+    DOMAIN_CLASSIFIER = _build_domain_classifier(DISPOSABLE_DOMAINS, DOMAIN_TYPOS)
     
     @classmethod
     def validate_format(cls, email):
@@ -46,6 +235,21 @@ class EmailValidator:
         Level 1: Validate email format
         Returns: (is_valid, error_message)
         """
+        # Cheap checks first, so obvious garbage never reaches a full regex
+        if not email or len(email) > MAX_EMAIL_LENGTH:
+            return False, "Invalid email format"
+        
+        at = email.rfind('@')
+        if at < 1 or at == len(email) - 1 or at > MAX_LOCAL_PART_LENGTH:
+            return False, "Invalid email format"
+        
+        if FORBIDDEN_EMAIL_CHARS_RE.search(email):
+            return False, "Invalid email format"
+        
+        # Fast path for ordinary addresses
+        if EMAIL_RE.fullmatch(email):
+            return True, None
+        
         try:
             validate_email(email)
             return True, None
@@ -55,64 +259,124 @@ class EmailValidator:
     @classmethod
     def check_domain_typo(cls, email):
         """
-        Check for common domain typos and suggest correction
+        Check for common domain typos and suggest correction: the known
+        typos in DOMAIN_TYPOS, then anything within MAX_TYPO_DISTANCE edits
+        of a popular provider (e.g. gmial.cm, htomail.com)
         Returns: (has_typo, suggested_email)
         """
-        if '@' not in email:
+        local, sep, domain = email.rpartition('@')
+        if not sep:
             return False, None
         
-        local, domain = email.rsplit('@', 1)
-        domain_lower = domain.lower()
-        
-        if domain_lower in cls.DOMAIN_TYPOS:
-            suggested = f"{local}@{cls.DOMAIN_TYPOS[domain_lower]}"
+        return cls._check_domain_typo(local, domain.lower())
+    
+    @classmethod
+    def _check_domain_typo(cls, local, domain):
+        """check_domain_typo for an already split, lowercased domain"""
+        if domain in cls.DOMAIN_TYPOS:
+            suggested = f"{local}@{cls.DOMAIN_TYPOS[domain]}"
             return True, suggested
         
+        if domain in KNOWN_MAIL_DOMAINS:
+            return False, None
+        
+        # Anything else within a couple of edits of a popular provider
+        closest = _closest_provider(domain)
+        if closest is not None:
+            return True, f"{local}@{closest}"
+        
         return False, None
     
     @classmethod
     def is_disposable(cls, email):
         """
-        Check if email is from a disposable email provider
+        Check if email is from a disposable email provider,
+        including any subdomain of one (e.g. foo.mailinator.com)
         Returns: bool
         """
-        if '@' not in email:
+        _, sep, domain = email.rpartition('@')
+        if not sep:
             return False
         
-        domain = email.rsplit('@', 1)[1].lower()
-        return domain in cls.DISPOSABLE_DOMAINS
+        return cls._is_disposable(domain.lower())
+    
+    @classmethod
+    def _is_disposable(cls, domain):
+        """is_disposable for a lowercased domain"""
+        # Try each suffix of at least two labels: a.b.mailinator.com,
+        # b.mailinator.com, mailinator.com - one set lookup per label
+        labels = domain.split('.')
+        return any(
+            '.'.join(labels[i:]) in cls.DISPOSABLE_DOMAINS
+            for i in range(len(labels) - 1)
+        )
     
     @classmethod
     def validate_domain(cls, email):
         """
         Level 2: Validate that email domain has MX records
+        Results are cached per domain for the record's TTL (at most
+        DOMAIN_CHECK_CACHE_TIMEOUT)
         Returns: (is_valid, error_message)
         """
-        if '@' not in email:
+        _, sep, domain = email.rpartition('@')
+        if not sep:
             return False, "Invalid email format"
         
-        domain = email.rsplit('@', 1)[1]
+        return cls._validate_domain(domain.lower())
+    
+    @classmethod
+    def _validate_domain(cls, domain):
+        """validate_domain for a lowercased domain"""
+        if domain in KNOWN_MAIL_DOMAINS:
+            return True, None
+        if domain in KNOWN_BAD_DOMAINS or domain.rpartition('.')[2] in RESERVED_TLDS:
+            return False, f"Domain '{domain}' cannot receive emails"
+        
+        cache_key = f'email-domain:{domain}'
+        
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return tuple(cached)
         
+        lookup = cls._lookup_domain(domain)
+        if lookup is not None:
+            result, ttl = lookup
+            cache.set(cache_key, result, min(ttl, DOMAIN_CHECK_CACHE_TIMEOUT))
+            return result
+        
+        # Don't block if DNS lookup fails, just warn (and don't cache)
+        return True, None
+    
+    @classmethod
+    def _lookup_domain(cls, domain):
+        """
+        Resolve MX (then A) records for domain.
+        Returns: ((is_valid, error_message), ttl), or None if the lookup
+        itself failed
+        """
         try:
             # Check for MX records
-            mx_records = dns.resolver.resolve(domain, 'MX')
+            mx_records = _get_resolver().resolve(domain, 'MX')
             if mx_records:
-                return True, None
+                return (True, None), mx_records.rrset.ttl
         except dns.resolver.NXDOMAIN:
-            return False, f"Domain '{domain}' does not exist"
+            return (False, f"Domain '{domain}' does not exist"), NEGATIVE_DOMAIN_CHECK_CACHE_TIMEOUT
         except dns.resolver.NoAnswer:
             # No MX record, try A record as fallback
             try:
-                dns.resolver.resolve(domain, 'A')
-                return True, None
+                a_records = _get_resolver().resolve(domain, 'A')
+                return (True, None), a_records.rrset.ttl
             except Exception:
-                return False, f"Domain '{domain}' cannot receive emails"
+                return (
+                    (False, f"Domain '{domain}' cannot receive emails"),
+                    NEGATIVE_DOMAIN_CHECK_CACHE_TIMEOUT
+                )
         except Exception as e:
             logger.warning(f"DNS lookup failed for {domain}: {e}")
-            # Don't block if DNS lookup fails, just warn
-            return True, None
+            return None
         
-        return False, "Domain cannot receive emails"
+        return (False, "Domain cannot receive emails"), NEGATIVE_DOMAIN_CHECK_CACHE_TIMEOUT
     
     @classmethod
     def validate_full(cls, email):
@@ -142,20 +406,32 @@ class EmailValidator:
             result['error'] = error
             return result
         
+        # Already lowercased and known to contain '@'; split it only once
+        local, _, domain = email.rpartition('@')
+        
+        # One regex pass: disposable, a known typo, or neither
+        match = cls.DOMAIN_CLASSIFIER.fullmatch(domain)
+        domain_class = match.lastgroup if match else None
+        
         # Check for typos
-        has_typo, suggestion = cls.check_domain_typo(email)
+        if domain_class == 'typo':
+            has_typo, suggestion = True, f"{local}@{cls.DOMAIN_TYPOS[domain]}"
+        elif domain_class is None:
+            has_typo, suggestion = cls._check_domain_typo(local, domain)
+        else:
+            has_typo, suggestion = False, None
         if has_typo:
             result['warnings'].append(f"Did you mean {suggestion}?")
             result['suggestion'] = suggestion
         
         # Check for disposable email
-        if cls.is_disposable(email):
+        if domain_class == 'disposable':
             result['is_valid'] = False
             result['error'] = "Disposable email addresses are not allowed"
             return result
         
         # Level 2: Domain validation
-        is_valid, error = cls.validate_domain(email)
+        is_valid, error = cls._validate_domain(domain)
         if not is_valid:
             result['is_valid'] = False
             result['error'] = error
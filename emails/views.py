@@ -4,16 +4,26 @@ Email Views
 API endpoints for email verification
 """
 
+import hashlib
+import uuid
+
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.core.cache import cache
 from django.utils import timezone
 
+from security.utils import check_rate_limit
+from .middleware import get_client_ip
 from .models import EmailVerificationToken
 from .services import EmailService
 from .validators import EmailValidator
 
+# (requests, window_seconds) per client IP
+VALIDATE_EMAIL_RATE_LIMIT = (30, 60)
+VALIDATE_EMAIL_CACHE_TIMEOUT = 300  # seconds
+
 
 class ValidateEmailView(APIView):
     """
@@ -31,7 +41,23 @@ class ValidateEmailView(APIView):
                 'error': 'Email is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        result = EmailValidator.validate_full(email)
+        # Every new address can cost a DNS lookup, so cap requests per IP
+        allowed, _, retry_after = check_rate_limit(
+            f'email-validate:{get_client_ip(request)}', *VALIDATE_EMAIL_RATE_LIMIT
+        )
+        if not allowed:
+            return Response({
+                'error': 'Rate limit exceeded',
+                'retry_after': retry_after
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        
+        # Keyed on a hash, so the cache never holds plaintext addresses
+        cache_key = f'email-validate:{hashlib.sha256(email.encode()).hexdigest()}'
+        result = cache.get(cache_key)
+        if result is None:
+            result = EmailValidator.validate_full(email)
+            cache.set(cache_key, result, VALIDATE_EMAIL_CACHE_TIMEOUT)
+        
         return Response(result)
 
 
@@ -46,27 +72,12 @@ class SendVerificationEmailView(APIView):
         user = request.user
         
         # Check if already verified
-        if getattr(user, 'email_verified', False):
+        if user.is_email_verified:
             return Response({
                 'message': 'Email already verified'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Invalidate old tokens
-        EmailVerificationToken.objects.filter(
-            user=user,
-            verified_at__isnull=True
-        ).delete()
-        
-        # Create new token
-        token = EmailVerificationToken.objects.create(
-            user=user,
-            email=user.email
-        )
-        
-        # Send verification email
-        sent = EmailService.send_verification_email(user, token)
-        
-        if sent:
+        if EmailService.issue_verification(user):
             return Response({
                 'message': 'Verification email sent',
                 'email': user.email
@@ -93,8 +104,10 @@ class VerifyEmailView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            token = EmailVerificationToken.objects.get(token=token_str)
-        except EmailVerificationToken.DoesNotExist:
+            token = EmailVerificationToken.objects.only(
+                'id', 'user_id', 'email', 'expires_at', 'verified_at'
+            ).get(token=uuid.UUID(str(token_str)))
+        except (ValueError, EmailVerificationToken.DoesNotExist):
             return Response({
                 'error': 'Invalid verification token'
             }, status=status.HTTP_400_BAD_REQUEST)
@@ -121,12 +134,8 @@ class VerifyEmailView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ResendVerificationView(APIView):
+class ResendVerificationView(SendVerificationEmailView):
     """
     Resend verification email
     POST /api/v1/email/resend-verification/
     """
-    permission_classes = [IsAuthenticated]
-    
-    def post(self, request):
-        return SendVerificationEmailView().post(request)